@@ -190,7 +190,7 @@ class SecurityAlert(Base):
     
     # Metadata
     tags = Column(JSON)
-    metadata = Column(JSON)
+    alert_metadata = Column("metadata", JSON)  # "metadata" is reserved on declarative models
 
 class SystemMetrics(Base):
     """Model for storing system performance and monitoring metrics"""
@@ -249,7 +249,7 @@ class AuditLog(Base):
     # Additional Context
     request_data = Column(JSON)
     response_data = Column(JSON)
-    metadata = Column(JSON)
+    audit_metadata = Column("metadata", JSON)  # "metadata" is reserved on declarative models
 
 # Indexes for performance optimization
 def create_indexes(engine):
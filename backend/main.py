@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import os
 import time
 import logging
 from typing import Dict, Any
@@ -179,10 +180,18 @@ async def system_status():
 
 if __name__ == "__main__":
     import uvicorn
+    # Reload is a dev-only convenience and cannot be combined with workers.
+    # Model files, alert counters and fingerprint caches are per-process, so
+    # extra workers are opt-in through WEB_CONCURRENCY
+    reload = os.environ.get("UVICORN_RELOAD") == "1"
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
+        port=int(os.environ.get("PORT", 8000)),
+        reload=reload,
+        workers=1 if reload else int(os.environ.get("WEB_CONCURRENCY", 1)),
+        loop="auto",
+        http="auto",
+        log_level="info" if reload else "warning",
+        access_log=reload
     )
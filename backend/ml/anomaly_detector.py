@@ -3,35 +3,68 @@ Machine Learning Anomaly Detection System for Cybersecurity Honeypot
 """
 
 import asyncio
+import functools
 import logging
+from collections import OrderedDict
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
-import pickle
 import json
 import hashlib
 from pathlib import Path
 
+import joblib
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, confusion_matrix
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
+from sqlalchemy import select
+
+try:
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+except ImportError:  # Optional: fall back to TorchScript inference
+    ort = None
 
 from database.connection import SessionLocal
 from database.models import AttackEvent, MLModel
 
 logger = logging.getLogger(__name__)
 
+SCORE_CACHE_SIZE = 8192
+
+def _request_key(data: Dict[str, Any]) -> bytes:
+    """Short blake2b digest of every request field the feature extractor reads"""
+    headers = data.get("headers") or {}
+    h = hashlib.blake2b(digest_size=8)
+    for part in (
+        data.get("url", ""),
+        data.get("user_agent", ""),
+        data.get("method", ""),
+        str(headers.get("content-type", "")),
+        f"{len(headers)}:{len(data.get('query_params') or {})}:"
+        f"{int('authorization' in headers)}{int('x-forwarded-for' in headers)}"
+    ):
+        h.update(part.encode("utf-8", "surrogatepass"))
+        h.update(b"|")
+    return h.digest()
+
+def _lower_bytes(value: str) -> bytes:
+    """Lower-case a request field and encode it for byte-pattern scans"""
+    return value.lower().encode("utf-8", "surrogatepass")
+
 class Autoencoder(nn.Module):
     """Simple autoencoder for anomaly detection"""
     
     def __init__(self, input_dim: int, hidden_dim: int = 32):
         super(Autoencoder, self).__init__()
+        self.input_dim = input_dim
+        self.hidden_dim = hidden_dim
         
         # Encoder
         self.encoder = nn.Sequential(
@@ -65,6 +98,8 @@ class AnomalyDetector:
     def __init__(self):
         self.isolation_forest = None
         self.autoencoder = None
+        self.autoencoder_inference = None
+        self.ort_session = None
         self.scaler = StandardScaler()
         self.label_encoders = {}
         self.feature_columns = []
@@ -72,39 +107,85 @@ class AnomalyDetector:
         self.model_path.mkdir(exist_ok=True)
         self.is_trained = False
         
-        # Feature extraction parameters
-        self.url_patterns = [
-            "sql", "union", "select", "insert", "delete", "update", "drop",
-            "script", "javascript", "onerror", "onload", "alert",
-            "admin", "login", "auth", "password", "user",
-            "../", "..\\", "/etc/passwd", "/windows/system32",
-            "eval", "exec", "system", "cmd", "shell"
-        ]
+        # Memoized scores keyed by _request_key: scanners replay the same
+        # probes constantly. Cleared whenever models change.
+        self._score_cache: "OrderedDict[bytes, float]" = OrderedDict()
         
-        self.user_agent_patterns = [
-            "sqlmap", "nikto", "nmap", "burp", "zap", "scanner",
-            "bot", "crawler", "spider", "scraper", "automated"
-        ]
+        # Feature extraction parameters (bytes: URLs are lower-cased and encoded once)
+        self.url_patterns = (
+            b"sql", b"union", b"select", b"insert", b"delete", b"update", b"drop",
+            b"script", b"javascript", b"onerror", b"onload", b"alert",
+            b"admin", b"login", b"auth", b"password", b"user",
+            b"../", b"..\\", b"/etc/passwd", b"/windows/system32",
+            b"eval", b"exec", b"system", b"cmd", b"shell"
+        )
+        
+        self.user_agent_patterns = frozenset(
+            b"sqlmap nikto nmap burp zap scanner bot crawler spider scraper automated".split()
+        )
+        self.tool_patterns = frozenset(b"sqlmap nikto nmap burp zap".split())
+        
+        # URL signatures used by classify_attack_type
+        self.url_categories = {
+            "sql_injection": (b"union", b"select", b"insert", b"delete", b"update", b"drop"),
+            "xss": (b"<script>", b"javascript:", b"onerror=", b"onload="),
+            "directory_traversal": (b"../", b"..\\", b"/etc/passwd", b"/windows/system32"),
+            "brute_force": (b"login", b"auth")
+        }
+        
+        # Every distinct URL pattern gets one bit; a single scan of the URL
+        # yields a mask that feature extraction and classification both read.
+        all_patterns = list(dict.fromkeys(
+            self.url_patterns + tuple(p for patterns in self.url_categories.values() for p in patterns)
+        ))
+        self._pattern_bits = tuple((pattern, 1 << i) for i, pattern in enumerate(all_patterns))
+        bit_of = dict(self._pattern_bits)
+        self._feature_mask = sum(bit_of[p] for p in set(self.url_patterns))
+        self._category_masks = {
+            category: sum(bit_of[p] for p in set(patterns))
+            for category, patterns in self.url_categories.items()
+        }
+        self._scan_url = functools.lru_cache(maxsize=8192)(self._scan_url_patterns)
+        self._scan_user_agent = functools.lru_cache(maxsize=4096)(self._scan_user_agent_patterns)
+    
+    def _scan_url_patterns(self, url: bytes) -> int:
+        """Return the bitmask of URL patterns contained in a lower-cased URL"""
+        mask = 0
+        for pattern, bit in self._pattern_bits:
+            if pattern in url:
+                mask |= bit
+        return mask
+    
+    def _scan_user_agent_patterns(self, user_agent: bytes) -> Tuple[int, bool]:
+        """Count suspicious patterns in a lower-cased user agent and flag known tools"""
+        hits = {pattern for pattern in self.user_agent_patterns if pattern in user_agent}
+        return len(hits), not hits.isdisjoint(self.tool_patterns)
     
     async def load_model(self):
         """Load pre-trained models"""
         try:
             logger.info("🧠 Loading ML models...")
             
-            # Try to load existing models
-            if (self.model_path / "isolation_forest.pkl").exists():
-                with open(self.model_path / "isolation_forest.pkl", "rb") as f:
-                    self.isolation_forest = pickle.load(f)
+            # Try to load existing models (memory-mapped so workers share the tree arrays)
+            if (self.model_path / "isolation_forest.joblib").exists():
+                self.isolation_forest = joblib.load(self.model_path / "isolation_forest.joblib", mmap_mode="r")
                 logger.info("✅ Isolation Forest model loaded")
             
             if (self.model_path / "autoencoder.pth").exists():
-                self.autoencoder = torch.load(self.model_path / "autoencoder.pth")
-                self.autoencoder.eval()
+                checkpoint = torch.load(
+                    self.model_path / "autoencoder.pth",
+                    map_location="cpu",
+                    weights_only=True,
+                    mmap=True
+                )
+                self.autoencoder = Autoencoder(checkpoint["input_dim"], checkpoint["hidden_dim"])
+                self.autoencoder.load_state_dict(checkpoint["state_dict"])
+                self._compile_autoencoder()
+                self._load_onnx_session()
                 logger.info("✅ Autoencoder model loaded")
             
-            if (self.model_path / "scaler.pkl").exists():
-                with open(self.model_path / "scaler.pkl", "rb") as f:
-                    self.scaler = pickle.load(f)
+            if (self.model_path / "scaler.joblib").exists():
+                self.scaler = joblib.load(self.model_path / "scaler.joblib", mmap_mode="r")
                 logger.info("✅ Scaler loaded")
             
             if (self.model_path / "feature_config.json").exists():
@@ -118,6 +199,7 @@ class AnomalyDetector:
             if not self.isolation_forest or not self.autoencoder:
                 await self.train_models()
             
+            self._score_cache.clear()
             self.is_trained = True
             logger.info("🎯 ML models ready for anomaly detection")
             
@@ -145,6 +227,9 @@ class AnomalyDetector:
                 logger.error("❌ No features extracted from training data")
                 return
             
+            # Fit the scaler on the training features so both models see standardized inputs
+            X = self.scaler.fit_transform(X)
+            
             # Split data for training
             X_train, X_test = train_test_split(X, test_size=0.2, random_state=42)
             
@@ -153,7 +238,8 @@ class AnomalyDetector:
             self.isolation_forest = IsolationForest(
                 contamination=0.1,  # Expect 10% anomalies
                 random_state=42,
-                n_estimators=100
+                n_estimators=100,
+                n_jobs=-1
             )
             self.isolation_forest.fit(X_train)
             
@@ -166,7 +252,9 @@ class AnomalyDetector:
             
             # Save models
             await self._save_models()
+            self._load_onnx_session()
             
+            self._score_cache.clear()
             self.is_trained = True
             logger.info("✅ ML models trained successfully")
             
@@ -181,62 +269,84 @@ class AnomalyDetector:
                 logger.warning("⚠️ Models not trained, returning default score")
                 return 0.5
             
+            key = _request_key(request_data)
+            cached = self._score_cache.get(key)
+            if cached is not None:
+                self._score_cache.move_to_end(key)
+                return cached
+            
             # Extract features from request
             features = await self._extract_single_features(request_data)
             
             if features is None:
                 return 0.0
             
-            # Scale features
-            features_scaled = self.scaler.transform([features])
-            
-            # Get anomaly scores from both models
-            iforest_score = self.isolation_forest.decision_function(features_scaled)[0]
+            # sklearn/torch inference blocks, so keep it off the event loop
+            score = await asyncio.to_thread(self._score_features, tuple(features))
             
-            # Convert Isolation Forest score to 0-1 range
-            iforest_normalized = 1 / (1 + np.exp(-iforest_score))
+            self._score_cache[key] = score
+            if len(self._score_cache) > SCORE_CACHE_SIZE:
+                self._score_cache.popitem(last=False)
             
-            # Get autoencoder score
-            with torch.no_grad():
-                features_tensor = torch.FloatTensor(features_scaled)
-                reconstructed = self.autoencoder(features_tensor)
-                mse = torch.mean((features_tensor - reconstructed) ** 2).item()
-                autoencoder_score = min(mse, 1.0)  # Cap at 1.0
-            
-            # Combine scores (weighted average)
-            combined_score = 0.6 * iforest_normalized + 0.4 * autoencoder_score
-            
-            return float(combined_score)
+            return score
             
         except Exception as e:
             logger.error(f"❌ Error predicting anomaly: {e}")
             return 0.0
     
+    def _score_features(self, features: Tuple[float, ...]) -> float:
+        """Score an extracted feature vector with both models"""
+        # Scale features
+        features_scaled = self.scaler.transform([features])
+        
+        # Get anomaly scores from both models
+        iforest_score = self.isolation_forest.decision_function(features_scaled)[0]
+        
+        # Convert Isolation Forest score to 0-1 range
+        iforest_normalized = 1 / (1 + np.exp(-iforest_score))
+        
+        # Get autoencoder score
+        if self.ort_session is not None:
+            features_f32 = features_scaled.astype(np.float32)
+            reconstructed = self.ort_session.run(None, {"x": features_f32})[0]
+            mse = float(np.mean((features_f32 - reconstructed) ** 2))
+        else:
+            with torch.inference_mode():
+                features_tensor = torch.FloatTensor(features_scaled)
+                reconstructed = self.autoencoder_inference(features_tensor)
+                mse = F.mse_loss(reconstructed, features_tensor, reduction="mean").item()
+        autoencoder_score = min(mse, 1.0)  # Cap at 1.0
+        
+        # Combine scores (weighted average)
+        combined_score = 0.6 * iforest_normalized + 0.4 * autoencoder_score
+        
+        return float(combined_score)
+    
     async def classify_attack_type(self, request_data: Dict[str, Any]) -> Tuple[str, float]:
         """Classify the type of attack"""
         try:
             # Simple rule-based classification (can be enhanced with ML)
-            url = request_data.get("url", "").lower()
-            user_agent = request_data.get("user_agent", "").lower()
+            url_mask = self._scan_url(_lower_bytes(request_data.get("url", "")))
+            _, is_tool = self._scan_user_agent(_lower_bytes(request_data.get("user_agent", "")))
             
             # SQL Injection
-            if any(pattern in url for pattern in ["union", "select", "insert", "delete", "update", "drop"]):
+            if url_mask & self._category_masks["sql_injection"]:
                 return "sql_injection", 0.9
             
             # XSS
-            elif any(pattern in url for pattern in ["<script>", "javascript:", "onerror=", "onload="]):
+            elif url_mask & self._category_masks["xss"]:
                 return "xss", 0.8
             
             # Directory Traversal
-            elif any(pattern in url for pattern in ["../", "..\\", "/etc/passwd", "/windows/system32"]):
+            elif url_mask & self._category_masks["directory_traversal"]:
                 return "directory_traversal", 0.9
             
             # Automated Tools
-            elif any(pattern in user_agent for pattern in ["sqlmap", "nikto", "nmap", "burp", "zap"]):
+            elif is_tool:
                 return "automated_tool", 0.7
             
             # Brute Force (would need session tracking)
-            elif "login" in url or "auth" in url:
+            elif url_mask & self._category_masks["brute_force"]:
                 return "brute_force", 0.6
             
             # Normal request
@@ -247,28 +357,31 @@ class AnomalyDetector:
             logger.error(f"❌ Error classifying attack type: {e}")
             return "unknown", 0.0
     
-    async def _get_training_data(self) -> List[Dict[str, Any]]:
+    async def _get_training_data(self) -> pd.DataFrame:
         """Get training data from database"""
+        columns = [
+            "url", "user_agent", "method", "headers", "query_params",
+            "attack_type", "is_anomaly", "anomaly_score"
+        ]
         try:
             db = SessionLocal()
             try:
-                # Get recent attack events
-                events = db.query(AttackEvent).filter(
-                    AttackEvent.timestamp >= datetime.utcnow() - timedelta(days=30)
-                ).limit(10000).all()
+                # Get recent attack events, selecting only the columns the
+                # feature extractor needs and streaming rows without ORM hydration
+                stmt = (
+                    select(*(getattr(AttackEvent, column) for column in columns))
+                    .where(AttackEvent.timestamp >= datetime.utcnow() - timedelta(days=30))
+                    .limit(10000)
+                    .execution_options(yield_per=1000)
+                )
+                training_data = pd.DataFrame.from_records(db.execute(stmt), columns=columns)
                 
-                training_data = []
-                for event in events:
-                    training_data.append({
-                        "url": event.url or "",
-                        "user_agent": event.user_agent or "",
-                        "method": event.method or "",
-                        "headers": event.headers or {},
-                        "query_params": event.query_params or {},
-                        "attack_type": event.attack_type or "normal",
-                        "is_anomaly": event.is_anomaly or False,
-                        "anomaly_score": event.anomaly_score or 0.0
-                    })
+                training_data = training_data.fillna({
+                    "url": "", "user_agent": "", "method": "",
+                    "attack_type": "normal", "is_anomaly": False, "anomaly_score": 0.0
+                })
+                training_data["headers"] = [h or {} for h in training_data["headers"]]
+                training_data["query_params"] = [q or {} for q in training_data["query_params"]]
                 
                 logger.info(f"📊 Retrieved {len(training_data)} training samples")
                 return training_data
@@ -278,61 +391,56 @@ class AnomalyDetector:
                 
         except Exception as e:
             logger.error(f"❌ Error getting training data: {e}")
-            return []
+            return pd.DataFrame(columns=columns)
     
-    async def _generate_synthetic_data(self, count: int) -> List[Dict[str, Any]]:
+    async def _generate_synthetic_data(self, count: int) -> pd.DataFrame:
         """Generate synthetic training data"""
         logger.info(f"🎭 Generating {count} synthetic training samples...")
         
-        synthetic_data = []
+        rng = np.random.default_rng(42)
         
         # Normal requests
         normal_count = int(count * 0.8)
-        for i in range(normal_count):
-            synthetic_data.append({
-                "url": f"/api/v1/users/{i}",
-                "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "method": "GET",
-                "headers": {"content-type": "application/json"},
-                "query_params": {},
-                "attack_type": "normal",
-                "is_anomaly": False,
-                "anomaly_score": np.random.uniform(0.0, 0.3)
-            })
+        normal = pd.DataFrame({
+            "url": [f"/api/v1/users/{i}" for i in range(normal_count)],
+            "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "method": "GET",
+            "attack_type": "normal",
+            "is_anomaly": False,
+            "anomaly_score": rng.uniform(0.0, 0.3, size=normal_count)
+        })
         
         # Attack requests
         attack_count = int(count * 0.2)
-        attack_types = ["sql_injection", "xss", "directory_traversal", "automated_tool"]
+        attack_urls = {
+            "sql_injection": "/api/users?id=1 UNION SELECT * FROM users WHERE 1=1--",
+            "xss": "/api/search?q=<script>alert('xss')</script>",
+            "directory_traversal": "/api/files/../../../etc/passwd",
+            "automated_tool": "/api/admin/config"
+        }
+        attack_kinds = rng.choice(list(attack_urls), size=attack_count)
+        attacks = pd.DataFrame({
+            "url": pd.Series(attack_kinds).map(attack_urls),
+            "user_agent": np.where(attack_kinds == "sql_injection", "sqlmap/1.0", "Mozilla/5.0"),
+            "method": "GET",
+            "attack_type": attack_kinds,
+            "is_anomaly": True,
+            "anomaly_score": rng.uniform(0.6, 1.0, size=attack_count)
+        })
         
-        for i in range(attack_count):
-            attack_type = np.random.choice(attack_types)
-            
-            if attack_type == "sql_injection":
-                url = f"/api/users?id=1 UNION SELECT * FROM users WHERE 1=1--"
-            elif attack_type == "xss":
-                url = f"/api/search?q=<script>alert('xss')</script>"
-            elif attack_type == "directory_traversal":
-                url = f"/api/files/../../../etc/passwd"
-            else:  # automated_tool
-                url = f"/api/admin/config"
-            
-            synthetic_data.append({
-                "url": url,
-                "user_agent": "sqlmap/1.0" if attack_type == "sql_injection" else "Mozilla/5.0",
-                "method": "GET",
-                "headers": {"content-type": "application/json"},
-                "query_params": {},
-                "attack_type": attack_type,
-                "is_anomaly": True,
-                "anomaly_score": np.random.uniform(0.6, 1.0)
-            })
+        synthetic_data = pd.concat([normal, attacks], ignore_index=True)
+        synthetic_data["headers"] = [{"content-type": "application/json"} for _ in range(len(synthetic_data))]
+        synthetic_data["query_params"] = [{} for _ in range(len(synthetic_data))]
         
         return synthetic_data
     
-    async def _extract_features(self, data: List[Dict[str, Any]]) -> np.ndarray:
+    async def _extract_features(self, data: Union[pd.DataFrame, List[Dict[str, Any]]]) -> np.ndarray:
         """Extract features from training data"""
         features_list = []
         
+        if isinstance(data, pd.DataFrame):
+            data = data.to_dict("records")
+        
         for item in data:
             features = await self._extract_single_features(item)
             if features is not None:
@@ -351,6 +459,7 @@ class AnomalyDetector:
         try:
             features = []
             url = data.get("url", "").lower()
+            url_bytes = url.encode("utf-8", "surrogatepass")
             user_agent = data.get("user_agent", "").lower()
             method = data.get("method", "").upper()
             headers = data.get("headers", {})
@@ -360,7 +469,7 @@ class AnomalyDetector:
             features.append(min(url_length / 1000, 1.0))  # Normalized URL length
             
             # Count suspicious patterns in URL
-            suspicious_patterns = sum(1 for pattern in self.url_patterns if pattern in url)
+            suspicious_patterns = bin(self._scan_url(url_bytes) & self._feature_mask).count("1")
             features.append(min(suspicious_patterns / 10, 1.0))  # Normalized pattern count
             
             # Query parameter count
@@ -372,7 +481,7 @@ class AnomalyDetector:
             features.append(min(ua_length / 500, 1.0))  # Normalized UA length
             
             # Suspicious user agent patterns
-            ua_suspicious = sum(1 for pattern in self.user_agent_patterns if pattern in user_agent)
+            ua_suspicious, _ = self._scan_user_agent(user_agent.encode("utf-8", "surrogatepass"))
             features.append(min(ua_suspicious / 5, 1.0))  # Normalized UA suspiciousness
             
             # Method encoding
@@ -412,36 +521,96 @@ class AnomalyDetector:
             input_dim = X_train.shape[1]
             hidden_dim = min(32, input_dim // 2)
             
-            self.autoencoder = Autoencoder(input_dim, hidden_dim)
+            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+            self.autoencoder = Autoencoder(input_dim, hidden_dim).to(device)
             criterion = nn.MSELoss()
             optimizer = optim.Adam(self.autoencoder.parameters(), lr=0.001)
             
-            # Convert to tensors
-            X_tensor = torch.FloatTensor(X_train)
-            dataset = TensorDataset(X_tensor)
-            dataloader = DataLoader(dataset, batch_size=32, shuffle=True)
+            # Keep the whole (small) training set as one tensor on the device and
+            # slice minibatches from it, rather than paying DataLoader overhead
+            X_tensor = torch.from_numpy(np.ascontiguousarray(X_train, dtype=np.float32))
+            if device.type == "cuda":
+                X_tensor = X_tensor.pin_memory()
+            X_tensor = X_tensor.to(device, non_blocking=True)
+            n_samples = X_tensor.shape[0]
+            batch_size = 32
+            n_batches = (n_samples + batch_size - 1) // batch_size
             
             # Training loop
             epochs = 50
             for epoch in range(epochs):
                 total_loss = 0
-                for batch in dataloader:
+                perm = torch.randperm(n_samples, device=device)
+                for i in range(0, n_samples, batch_size):
+                    batch = X_tensor[perm[i:i + batch_size]]
                     optimizer.zero_grad()
-                    reconstructed = self.autoencoder(batch[0])
-                    loss = criterion(reconstructed, batch[0])
+                    reconstructed = self.autoencoder(batch)
+                    loss = criterion(reconstructed, batch)
                     loss.backward()
                     optimizer.step()
                     total_loss += loss.item()
                 
                 if epoch % 10 == 0:
-                    logger.info(f"Autoencoder epoch {epoch}, loss: {total_loss/len(dataloader):.4f}")
+                    logger.info(f"Autoencoder epoch {epoch}, loss: {total_loss/n_batches:.4f}")
             
+            # Inference and checkpoints are CPU-only
+            self.autoencoder.to("cpu")
+            self._compile_autoencoder()
             logger.info("✅ Autoencoder training completed")
             
         except Exception as e:
             logger.error(f"❌ Error training autoencoder: {e}")
             raise
     
+    def _compile_autoencoder(self):
+        """Build a frozen TorchScript copy of the autoencoder for inference"""
+        self.autoencoder.eval()
+        try:
+            torch.jit.enable_onednn_fusion(True)
+            self.autoencoder_inference = torch.jit.optimize_for_inference(
+                torch.jit.script(self.autoencoder)
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ TorchScript compilation failed, using eager autoencoder: {e}")
+            self.autoencoder_inference = self.autoencoder
+    
+    def _export_onnx(self):
+        """Export the autoencoder to ONNX and quantize it to int8"""
+        onnx_path = self.model_path / "autoencoder.onnx"
+        torch.onnx.export(
+            self.autoencoder.eval(),
+            torch.zeros(1, self.autoencoder.input_dim),
+            str(onnx_path),
+            input_names=["x"],
+            output_names=["reconstructed"],
+            dynamic_axes={"x": {0: "batch"}},
+            opset_version=17
+        )
+        quantize_dynamic(
+            str(onnx_path),
+            str(self.model_path / "autoencoder.int8.onnx"),
+            weight_type=QuantType.QInt8
+        )
+    
+    def _remove_onnx(self):
+        """Delete exported ONNX files so a stale model can't outlive a retrain"""
+        for name in ("autoencoder.onnx", "autoencoder.int8.onnx"):
+            (self.model_path / name).unlink(missing_ok=True)
+    
+    def _load_onnx_session(self):
+        """Open an ONNX Runtime session on the quantized autoencoder if available"""
+        self.ort_session = None
+        quantized_path = self.model_path / "autoencoder.int8.onnx"
+        if ort is None or not quantized_path.exists():
+            return
+        try:
+            self.ort_session = ort.InferenceSession(
+                str(quantized_path), providers=["CPUExecutionProvider"]
+            )
+            logger.info("✅ ONNX Runtime autoencoder session ready")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load ONNX autoencoder, using TorchScript: {e}")
+    
     async def _evaluate_models(self, X_test: np.ndarray):
         """Evaluate model performance"""
         try:
@@ -450,10 +619,10 @@ class AnomalyDetector:
             iforest_scores = self.isolation_forest.decision_function(X_test)
             
             # Autoencoder evaluation
-            with torch.no_grad():
+            with torch.inference_mode():
                 X_tensor = torch.FloatTensor(X_test)
-                reconstructed = self.autoencoder(X_tensor)
-                mse_scores = torch.mean((X_tensor - reconstructed) ** 2, dim=1).numpy()
+                reconstructed = self.autoencoder_inference(X_tensor)
+                mse_scores = F.mse_loss(reconstructed, X_tensor, reduction="none").mean(dim=1).numpy()
             
             logger.info(f"📊 Model evaluation completed:")
             logger.info(f"   Isolation Forest: {np.sum(iforest_predictions == -1)} anomalies detected")
@@ -465,16 +634,30 @@ class AnomalyDetector:
     async def _save_models(self):
         """Save trained models to disk"""
         try:
-            # Save Isolation Forest
-            with open(self.model_path / "isolation_forest.pkl", "wb") as f:
-                pickle.dump(self.isolation_forest, f)
-            
-            # Save Autoencoder
-            torch.save(self.autoencoder, self.model_path / "autoencoder.pth")
+            # Drop the previous run's ONNX export first; only a successful export
+            # below leaves a quantized model for _load_onnx_session to pick up
+            self._remove_onnx()
+            
+            # Save Isolation Forest (uncompressed so it can be memory-mapped on load)
+            joblib.dump(self.isolation_forest, self.model_path / "isolation_forest.joblib", compress=0)
+            
+            # Save Autoencoder weights plus the config needed to rebuild it
+            torch.save({
+                "state_dict": self.autoencoder.state_dict(),
+                "input_dim": self.autoencoder.input_dim,
+                "hidden_dim": self.autoencoder.hidden_dim
+            }, self.model_path / "autoencoder.pth")
+            
+            # Export a quantized ONNX copy for the per-request path
+            if ort is not None:
+                try:
+                    self._export_onnx()
+                except Exception as e:
+                    logger.warning(f"⚠️ ONNX export failed: {e}")
+                    self._remove_onnx()
             
             # Save Scaler
-            with open(self.model_path / "scaler.pkl", "wb") as f:
-                pickle.dump(self.scaler, f)
+            joblib.dump(self.scaler, self.model_path / "scaler.joblib", compress=0)
             
             # Save feature configuration
             config = {
@@ -484,9 +667,6 @@ class AnomalyDetector:
             with open(self.model_path / "feature_config.json", "w") as f:
                 json.dump(config, f)
             
-            # Fit scaler with training data
-            self.scaler.fit(np.array([[0] * len(self.feature_columns)]))
-            
             logger.info("💾 Models saved successfully")
             
         except Exception as e:
@@ -498,3 +678,5 @@ class AnomalyDetector:
         # Cleanup resources if needed
         self.isolation_forest = None
         self.autoencoder = None
+        self.autoencoder_inference = None
+        self.ort_session = None
@@ -5,17 +5,40 @@ Runs without database dependencies for quick testing
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+import asyncio
+import functools
+import gzip
+import hashlib
+import itertools
+import math
+import os
 import time
 import random
 import json
-from datetime import datetime
-from typing import Dict, Any, List
+import re
+import sys
+import orjson
+from collections import Counter
+from array import array
+from html import escape as _h
+import jinja2
+from datetime import datetime, timedelta
+from urllib.parse import parse_qsl
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+
+class JSONResponse(ORJSONResponse):
+    """orjson-encoded response that, like the stdlib encoder, accepts
+    non-string dict keys (benign SQL probes are counted under None)"""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
 app = FastAPI(
     title="AI Cybersecurity Honeypot - Demo",
     description="Educational security research platform (Demo Version)",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=JSONResponse
 )
 
 # CORS middleware
@@ -27,10 +50,422 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for demo
-attacks_db = []
+# Attack times are kept as integer UTC epoch milliseconds and only
+# formatted when records are read back out
+_EPOCH = datetime(1970, 1, 1)
+
+@functools.lru_cache(maxsize=256)
+def _iso_second(sec: int) -> str:
+    # Attack bursts share seconds, so the datetime formatting happens
+    # about once per second of traffic rather than once per record
+    return (_EPOCH + timedelta(seconds=sec)).isoformat()
+
+def _iso_from_ms(ts_ms: int) -> str:
+    sec, ms = divmod(ts_ms, 1000)
+    # Same shape as datetime.isoformat(), which omits a zero fraction
+    return f"{_iso_second(sec)}.{ms:03d}000" if ms else _iso_second(sec)
+
+# Columns every attack record carries; anything else a handler records
+# (username, query, path, ...) is kept in a per-record extras dict
+_ATTACK_FIELDS = (
+    "id", "ts_ms", "source_ip", "user_agent", "method", "endpoint",
+    "attack_type", "severity", "confidence", "anomaly_score", "is_anomaly"
+)
+
+class Attack:
+    """A single honeypot hit; slotted to keep queued records small"""
+    
+    __slots__ = _ATTACK_FIELDS + ("extra",)
+    
+    def __init__(self, id: int, ts_ms: int, source_ip: str, user_agent: str,
+                 method: str, endpoint: str, attack_type: Optional[str], severity: str,
+                 confidence: float, anomaly_score: float, is_anomaly: bool,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.ts_ms = ts_ms
+        self.source_ip = source_ip
+        self.user_agent = user_agent
+        self.method = method
+        self.endpoint = endpoint
+        self.attack_type = attack_type
+        self.severity = severity
+        self.confidence = confidence
+        self.anomaly_score = anomaly_score
+        self.is_anomaly = is_anomaly
+        self.extra = extra
+
+# Severities counted as active alerts
+_HIGH_CRITICAL = frozenset(("high", "critical"))
+
+class HyperLogLog:
+    """Fixed-memory distinct-count estimator (2**p one-byte registers,
+    about 1.6% standard error at p=12)"""
+    
+    def __init__(self, p: int = 12):
+        self.p = p
+        self.m = 1 << p
+        self._registers = bytearray(self.m)
+        self._alpha = 0.7213 / (1 + 1.079 / self.m)
+        # Harmonic sum and empty-register count, kept up to date on add so
+        # count() doesn't rescan the registers
+        self._inverse_sum = float(self.m)
+        self._zeros = self.m
+    
+    def add(self, value: str):
+        x = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+        idx = x >> (64 - self.p)
+        rest = x & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        old = self._registers[idx]
+        if rank > old:
+            self._registers[idx] = rank
+            self._inverse_sum += 2.0 ** -rank - 2.0 ** -old
+            if not old:
+                self._zeros -= 1
+    
+    def count(self) -> int:
+        m = self.m
+        estimate = self._alpha * m * m / self._inverse_sum
+        zeros = self._zeros
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+class AttackRing:
+    """Fixed-capacity ring buffer of attack records stored column-wise.
+    
+    Numeric fields live in typed arrays and low-cardinality strings
+    (attack type, severity) as small-int codes, so memory stays bounded.
+    Analytics aggregates are kept as running counters over the live
+    window, updated on append and eviction, so reading them is O(1).
+    """
+    
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = capacity
+        self.total = 0  # records ever appended, including evicted ones
+        self._id = array("q", bytes(8 * capacity))
+        self._ts_ms = array("q", bytes(8 * capacity))
+        self._source_ip: List[str] = [""] * capacity
+        # HTML-escaped once at ingest for the analytics page
+        self._source_ip_html: List[str] = [""] * capacity
+        self._user_agent: List[str] = [""] * capacity
+        self._method: List[str] = [""] * capacity
+        self._endpoint: List[str] = [""] * capacity
+        self._attack_type = array("H", bytes(2 * capacity))
+        self._severity = array("H", bytes(2 * capacity))
+        self._confidence = array("d", bytes(8 * capacity))
+        self._anomaly_score = array("d", bytes(8 * capacity))
+        self._is_anomaly = array("b", bytes(capacity))
+        self._extra: List[Optional[Dict[str, Any]]] = [None] * capacity
+        # Code 0 marks an empty slot; each code also gets its escaped
+        # display title and escaped raw name, built once
+        self._codes: Dict[Any, int] = {}
+        self._names: List[Any] = [None]
+        self._titles: List[str] = [""]
+        self._names_html: List[str] = [""]
+        # Running aggregates over the live records
+        self._type_counts: Counter = Counter()
+        self._severity_counts: Counter = Counter()
+        self._source_counts: Counter = Counter()
+        self._anomalies = 0
+        self._high_critical = 0
+        # Evicted records leave the exact counters; the sketch keeps an
+        # all-time distinct-source estimate in 4KB
+        self._source_sketch = HyperLogLog()
+    
+    def _code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._names)
+            self._names.append(value)
+            name = "unknown" if value is None else str(value)
+            self._titles.append(_h(name.replace("_", " ").title()))
+            self._names_html.append(_h(name))
+        return code
+    
+    def append(self, attack: Attack):
+        """Store an attack record, evicting the oldest one when full"""
+        i = self.total % self.capacity
+        if self.total >= self.capacity:
+            self._evict(i)
+        self._id[i] = attack.id
+        self._ts_ms[i] = attack.ts_ms
+        # Scanners repeat their address thousands of times; interning keeps
+        # one string per source and makes Counter lookups pointer compares
+        source_ip = sys.intern(attack.source_ip)
+        self._source_ip[i] = source_ip
+        self._source_ip_html[i] = _h(source_ip)
+        self._user_agent[i] = attack.user_agent
+        self._method[i] = attack.method
+        self._endpoint[i] = attack.endpoint
+        self._attack_type[i] = self._code(attack.attack_type)
+        self._severity[i] = self._code(attack.severity)
+        self._confidence[i] = attack.confidence
+        self._anomaly_score[i] = attack.anomaly_score
+        self._is_anomaly[i] = bool(attack.is_anomaly)
+        self._extra[i] = attack.extra or None
+        self.total += 1
+        self._type_counts[attack.attack_type] += 1
+        self._severity_counts[attack.severity] += 1
+        self._source_counts[source_ip] += 1
+        self._source_sketch.add(source_ip)
+        self._anomalies += self._is_anomaly[i]
+        self._high_critical += attack.severity in _HIGH_CRITICAL
+    
+    def extend(self, attacks):
+        """Store a batch of attack records in order"""
+        append = self.append
+        for attack in attacks:
+            append(attack)
+    
+    @staticmethod
+    def _discount(counter: Counter, key: Any):
+        counter[key] -= 1
+        if not counter[key]:
+            del counter[key]
+    
+    def _evict(self, i: int):
+        """Take the record in slot i out of the running aggregates"""
+        self._discount(self._type_counts, self._names[self._attack_type[i]])
+        self._discount(self._severity_counts, self._names[self._severity[i]])
+        self._discount(self._source_counts, self._source_ip[i])
+        self._anomalies -= self._is_anomaly[i]
+        self._high_critical -= self._names[self._severity[i]] in _HIGH_CRITICAL
+    
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+    
+    def _slots(self, newest_first: bool = False) -> Iterator[int]:
+        """Physical slot indices of live records, oldest first by default"""
+        n = len(self)
+        start = self.total - n
+        order = range(self.total - 1, start - 1, -1) if newest_first else range(start, self.total)
+        return (k % self.capacity for k in order)
+    
+    def _record(self, i: int) -> Dict[str, Any]:
+        record = {
+            "id": self._id[i],
+            "timestamp": _iso_from_ms(self._ts_ms[i]),
+            "source_ip": self._source_ip[i],
+            "user_agent": self._user_agent[i],
+            "method": self._method[i],
+            "endpoint": self._endpoint[i],
+            "attack_type": self._names[self._attack_type[i]],
+            "severity": self._names[self._severity[i]],
+            "confidence": self._confidence[i],
+            "anomaly_score": self._anomaly_score[i],
+            "is_anomaly": bool(self._is_anomaly[i]),
+        }
+        if self._extra[i]:
+            record.update(self._extra[i])
+        return record
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._record(i) for i in self._slots())
+    
+    def __reversed__(self) -> Iterator[Dict[str, Any]]:
+        return (self._record(i) for i in self._slots(newest_first=True))
+    
+    def iter_tail(self, n: int) -> Iterator[Dict[str, Any]]:
+        """Lazily yield the newest n records, oldest first"""
+        n = max(0, min(n, len(self)))
+        return (self._record(k % self.capacity) for k in range(self.total - n, self.total))
+    
+    def tail(self, n: int) -> List[Dict[str, Any]]:
+        """The newest n records, oldest first"""
+        return list(self.iter_tail(n))
+    
+    def attack_type_counts(self) -> Dict[Any, int]:
+        return dict(self._type_counts)
+    
+    def severity_counts(self) -> Dict[Any, int]:
+        return dict(self._severity_counts)
+    
+    def title_html(self, name: Any) -> str:
+        """Escaped display title ("Sql Injection") of an attack type or severity"""
+        return self._titles[self._codes[name]]
+    
+    def name_html(self, name: Any) -> str:
+        return self._names_html[self._codes[name]]
+    
+    def display_recent(self, n: int) -> Iterator[Tuple[str, str, str, str]]:
+        """Lazily yield (time, type title, severity, source IP) of the newest
+        n records, newest first, all already HTML-safe"""
+        n = max(0, min(n, len(self)))
+        for k in range(self.total - 1, self.total - n - 1, -1):
+            i = k % self.capacity
+            yield (
+                _iso_from_ms(self._ts_ms[i])[:19].replace("T", " "),
+                self._titles[self._attack_type[i]],
+                self._names_html[self._severity[i]],
+                self._source_ip_html[i]
+            )
+    
+    def top_attack_types(self, k: int) -> List[Tuple[Any, int]]:
+        return self._type_counts.most_common(k)
+    
+    def top_severities(self, k: int) -> List[Tuple[Any, int]]:
+        return self._severity_counts.most_common(k)
+    
+    def high_critical_count(self) -> int:
+        return self._high_critical
+    
+    def anomaly_count(self) -> int:
+        return self._anomalies
+    
+    def unique_sources(self) -> int:
+        return len(self._source_counts)
+    
+    def unique_sources_all_time(self) -> int:
+        """Estimated distinct sources, including evicted records"""
+        return self._source_sketch.count()
+
+# In-memory storage for demo, bounded so scanner floods can't exhaust memory
+attacks_db = AttackRing(int(os.environ.get("HP_MAX_ATTACKS", 100_000)))
 attackers_db = {}
 
+# Pre-drawn pool of uniform [0, 1) floats for the fake scores; a masked
+# index read is cheaper than a Mersenne Twister call per score
+_RNG_POOL_MASK = (1 << 15) - 1
+_RNG_POOL = array("d", (random.random() for _ in range(_RNG_POOL_MASK + 1)))
+_rng_idx = 0
+
+def _rand(lo: float, hi: float) -> float:
+    """Uniform float in [lo, hi) drawn from the pre-drawn pool"""
+    global _rng_idx
+    v = _RNG_POOL[_rng_idx & _RNG_POOL_MASK]
+    _rng_idx += 1
+    return lo + v * (hi - lo)
+
+# Monotonic attack ids; the ring evicts and writes are queued, so its
+# length is not the next id
+_NEXT_ID = itertools.count(1).__next__
+
+# Cached wall clock, refreshed by a background task; attack logs don't
+# need sub-100ms precision and datetime formatting is costly per request
+_CLOCK_INTERVAL = 0.1
+_NOW_ISO = datetime.utcnow().isoformat()
+_NOW_HUMAN = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+_clock_task = None
+
+async def _tick():
+    """Refresh the cached timestamp strings"""
+    global _NOW_ISO, _NOW_HUMAN
+    while True:
+        now = datetime.utcnow()
+        _NOW_ISO = now.isoformat()
+        _NOW_HUMAN = now.strftime("%Y-%m-%d %H:%M:%S")
+        await asyncio.sleep(_CLOCK_INTERVAL)
+
+@app.on_event("startup")
+async def start_clock():
+    """Start the cached clock"""
+    global _clock_task
+    _clock_task = asyncio.create_task(_tick())
+
+# Attack log writes are queued by handlers and flushed in batches by a
+# background task, keeping storage work off the request path
+_ATTACK_QUEUE_SIZE = 10_000
+_FLUSH_BATCH = 512
+_FLUSH_INTERVAL = 0.02
+_attack_queue: Optional[asyncio.Queue] = None
+_flush_task = None
+dropped_attacks = 0
+
+def log_attack(attack: Attack):
+    """Queue an attack record for the background flusher"""
+    global dropped_attacks
+    if _attack_queue is None:
+        # Flusher not running (e.g. startup events skipped), write directly
+        attacks_db.append(attack)
+        return
+    try:
+        _attack_queue.put_nowait(attack)
+    except asyncio.QueueFull:
+        dropped_attacks += 1
+
+def _logged_attack_count() -> int:
+    """Attacks stored so far, counting records still waiting in the queue"""
+    return len(attacks_db) + (_attack_queue.qsize() if _attack_queue is not None else 0)
+
+async def _flush_loop():
+    """Drain queued attack records into storage in batches"""
+    while True:
+        batch = [await _attack_queue.get()]
+        while len(batch) < _FLUSH_BATCH and not _attack_queue.empty():
+            batch.append(_attack_queue.get_nowait())
+        attacks_db.extend(batch)
+        await asyncio.sleep(_FLUSH_INTERVAL)
+
+@app.on_event("startup")
+async def start_attack_flusher():
+    """Create the attack queue and start the batch flusher"""
+    global _attack_queue, _flush_task
+    # Created here rather than at import so it binds to the server's loop
+    _attack_queue = asyncio.Queue(maxsize=_ATTACK_QUEUE_SIZE)
+    _flush_task = asyncio.create_task(_flush_loop())
+
+# Attack signatures, compiled once at import
+_SQL_INJECTION_PATTERNS = [
+    "union", "select", "insert", "update", "delete", "drop", "create",
+    "alter", "exec", "execute", "script", "javascript", "vbscript",
+    "onload", "onerror", "onclick", "or 1=1", "and 1=1", "'; drop",
+    "admin'--", "' or '1'='1", "1' or '1'='1", "1' or 1=1--"
+]
+_TRAVERSAL_PATTERNS = ["../", "..\\", "/etc/passwd", "/windows/system32"]
+SQL_INJECTION_RE = re.compile("|".join(map(re.escape, _SQL_INJECTION_PATTERNS)), re.IGNORECASE)
+TRAVERSAL_RE = re.compile("|".join(map(re.escape, _TRAVERSAL_PATTERNS)), re.IGNORECASE)
+
+# Brotli is optional; static pages fall back to gzip without it
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Aho-Corasick automata scan for every signature in one C-level pass;
+# optional, the compiled regexes above are used when it isn't installed
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+def _build_automaton(patterns: List[str]):
+    automaton = ahocorasick.Automaton()
+    for pattern in patterns:
+        automaton.add_word(pattern, pattern)
+    automaton.make_automaton()
+    return automaton
+
+# Inputs shorter than every signature (empty included) can't match, which
+# settles most benign probes before any scan
+_SQL_MIN_LEN = min(map(len, _SQL_INJECTION_PATTERNS))
+_TRAVERSAL_MIN_LEN = min(map(len, _TRAVERSAL_PATTERNS))
+
+if ahocorasick is not None:
+    _SQL_AC = _build_automaton(_SQL_INJECTION_PATTERNS)
+    _TRAVERSAL_AC = _build_automaton(_TRAVERSAL_PATTERNS)
+
+    def is_sql_injection(query: str) -> bool:
+        if len(query) < _SQL_MIN_LEN:
+            return False
+        return next(_SQL_AC.iter(query.lower()), None) is not None
+
+    def is_traversal_attempt(path: str) -> bool:
+        if len(path) < _TRAVERSAL_MIN_LEN:
+            return False
+        return next(_TRAVERSAL_AC.iter(path.lower()), None) is not None
+else:
+    def is_sql_injection(query: str) -> bool:
+        if len(query) < _SQL_MIN_LEN:
+            return False
+        return SQL_INJECTION_RE.search(query) is not None
+
+    def is_traversal_attempt(path: str) -> bool:
+        if len(path) < _TRAVERSAL_MIN_LEN:
+            return False
+        return TRAVERSAL_RE.search(path) is not None
+
 @app.get("/overview", response_class=HTMLResponse)
 async def system_overview():
     """System overview and navigation page"""
@@ -41,38 +476,93 @@ async def system_overview():
     except FileNotFoundError:
         return HTMLResponse(content="<h1>Overview page not found</h1><p><a href='/'>Go to main page</a></p>", status_code=404)
 
+# Returned as-is; returning dicts would send every response through
+# jsonable_encoder before orjson sees it
+_ROOT_INFO = JSONResponse(content={
+    "message": "AI Cybersecurity Honeypot API - Demo Version",
+    "version": "1.0.0",
+    "status": "operational",
+    "warning": "⚠️ EDUCATIONAL USE ONLY - DEMO VERSION",
+    "endpoints": {
+        "docs": "/docs",
+        "health": "/health",
+        "honeypots": "/honeypots",
+        "analytics": "/analytics",
+        "attacks": "/attacks",
+        "overview": "/overview"
+    }
+})
+
 @app.get("/")
 async def root():
     """Root endpoint with system information"""
-    return {
-        "message": "AI Cybersecurity Honeypot API - Demo Version",
-        "version": "1.0.0",
-        "status": "operational",
-        "warning": "⚠️ EDUCATIONAL USE ONLY - DEMO VERSION",
-        "endpoints": {
-            "docs": "/docs",
-            "health": "/health",
-            "honeypots": "/honeypots",
-            "analytics": "/analytics",
-            "attacks": "/attacks",
-            "overview": "/overview"
-        }
-    }
+    return _ROOT_INFO
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {
+    return JSONResponse(content={
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _NOW_ISO,
         "service": "AI Cybersecurity Honeypot API - Demo",
         "version": "1.0.0"
-    }
+    })
 
-@app.get("/honeypots/login", response_class=HTMLResponse)
-async def fake_login_page():
-    """Simulate a vulnerable login page"""
-    html_content = """
+def _client_info(request: Request):
+    """Client IP and user agent read straight from the ASGI scope"""
+    scope = request.scope
+    client = scope.get("client")
+    user_agent = ""
+    for key, value in scope["headers"]:
+        if key == b"user-agent":
+            user_agent = value.decode("latin-1")
+            break
+    return (client[0] if client else "-"), user_agent
+
+def _static_page(html: str):
+    """Encode and precompress a static page once, one ETag per encoding"""
+    body = html.encode()
+    tag = hashlib.blake2b(body, digest_size=8).hexdigest()
+    variants = {"identity": (body, f'"{tag}"')}
+    variants["gzip"] = (gzip.compress(body, 9), f'"{tag}-gzip"')
+    if brotli is not None:
+        variants["br"] = (brotli.compress(body, quality=11), f'"{tag}-br"')
+    return variants
+
+def _accepts_encoding(request: Request, coding: str) -> bool:
+    """Whether Accept-Encoding lists coding with a non-zero q-value"""
+    for item in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = item.partition(";")
+        if name.strip().lower() != coding:
+            continue
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+def _serve_static(request: Request, page) -> Response:
+    """Serve a precompressed page, answering revalidations with 304"""
+    if "br" in page and _accepts_encoding(request, "br"):
+        encoding = "br"
+    elif _accepts_encoding(request, "gzip"):
+        encoding = "gzip"
+    else:
+        encoding = "identity"
+    body, etag = page[encoding]
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=60", "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return HTMLResponse(content=body, headers=headers)
+
+# Static honeypot pages, built once at import
+_LOGIN_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -113,51 +603,60 @@ async def fake_login_page():
     </body>
     </html>
     """
-    return HTMLResponse(content=html_content)
+
+_LOGIN_PAGE = _static_page(_LOGIN_HTML)
+
+@app.get("/honeypots/login", response_class=HTMLResponse)
+async def fake_login_page(request: Request):
+    """Simulate a vulnerable login page"""
+    return _serve_static(request, _LOGIN_PAGE)
+
+async def _read_form(request: Request):
+    """Parse a submitted form, skipping the multipart parser for the
+    plain urlencoded bodies the login page actually sends"""
+    if request.headers.get("content-type", "").startswith("application/x-www-form-urlencoded"):
+        body = await request.body()
+        return dict(parse_qsl(body.decode("latin-1"), keep_blank_values=True))
+    return await request.form()
+
+# Fake credentials the login honeypot accepts
+_FAKE_CREDENTIALS = {
+    "admin": "admin123",
+    "user": "password",
+    "test": "test"
+}
 
 @app.post("/honeypots/login")
 async def fake_login_submit(request: Request):
     """Handle fake login attempts"""
     try:
-        form_data = await request.form()
+        form_data = await _read_form(request)
         username = form_data.get("username", "")
         password = form_data.get("password", "")
         
         # Get client info
-        client_ip = request.client.host
-        user_agent = request.headers.get("user-agent", "")
-        
-        # Simulate login processing
-        import asyncio
-        await asyncio.sleep(0.5)
+        client_ip, user_agent = _client_info(request)
         
         # Check against fake credentials
-        valid_credentials = {
-            "admin": "admin123",
-            "user": "password",
-            "test": "test"
-        }
-        
-        is_valid = username in valid_credentials and valid_credentials[username] == password
+        is_valid = _FAKE_CREDENTIALS.get(username) == password
         
         # Record attack
-        attack = {
-            "id": len(attacks_db) + 1,
-            "timestamp": datetime.utcnow().isoformat(),
-            "source_ip": client_ip,
-            "user_agent": user_agent,
-            "method": "POST",
-            "endpoint": "/honeypots/login",
-            "attack_type": "brute_force" if not is_valid else "credential_theft",
-            "severity": "high" if not is_valid else "medium",
-            "confidence": 0.8 if not is_valid else 0.6,
-            "anomaly_score": random.uniform(0.6, 0.9) if not is_valid else random.uniform(0.3, 0.5),
-            "is_anomaly": not is_valid,
-            "username": username,
-            "success": is_valid
-        }
+        attack = Attack(
+            id=_NEXT_ID(),
+            ts_ms=time.time_ns() // 1_000_000,
+            source_ip=client_ip,
+            user_agent=user_agent,
+            method="POST",
+            endpoint="/honeypots/login",
+            attack_type="brute_force" if not is_valid else "credential_theft",
+            severity="high" if not is_valid else "medium",
+            confidence=0.8 if not is_valid else 0.6,
+            anomaly_score=_rand(0.6, 0.9) if not is_valid else _rand(0.3, 0.5),
+            is_anomaly=not is_valid,
+            extra={"username": username, "success": is_valid}
+        )
         
-        attacks_db.append(attack)
+        log_attack(attack)
         
         if is_valid:
             return JSONResponse(
@@ -181,51 +680,7 @@ async def fake_login_submit(request: Request):
             content={"error": "Internal server error", "detail": str(e)}
         )
 
-@app.get("/honeypots/sql", response_class=HTMLResponse)
-async def fake_sql_interface(request: Request, query: str = ""):
-    """Professional SQL database interface honeypot"""
-    client_ip = request.client.host
-    user_agent = request.headers.get("user-agent", "")
-    
-    # Analyze for SQL injection
-    sql_patterns = [
-        "union", "select", "insert", "update", "delete", "drop", "create",
-        "alter", "exec", "execute", "script", "javascript", "vbscript",
-        "onload", "onerror", "onclick", "or 1=1", "and 1=1", "'; drop",
-        "admin'--", "' or '1'='1", "1' or '1'='1", "1' or 1=1--"
-    ]
-    
-    attack_detected = any(pattern.lower() in query.lower() for pattern in sql_patterns)
-    attack_type = "sql_injection" if attack_detected else None
-    
-    # Record the attack
-    attack = {
-        "id": len(attacks_db) + 1,
-        "timestamp": datetime.utcnow().isoformat(),
-        "source_ip": client_ip,
-        "user_agent": user_agent,
-        "method": "GET",
-        "endpoint": "/honeypots/sql",
-        "query": query,
-        "attack_type": attack_type,
-        "severity": "high" if attack_detected else "low",
-        "confidence": 0.9 if attack_detected else 0.1,
-        "anomaly_score": random.uniform(0.8, 0.95) if attack_detected else random.uniform(0.1, 0.3),
-        "is_anomaly": attack_detected,
-    }
-    attacks_db.append(attack)
-    
-    # Generate fake SQL results for demonstration
-    fake_results = []
-    if attack_detected and "union" in query.lower() and "select" in query.lower():
-        fake_results = [
-            {"id": 1, "name": "John Doe", "email": "john@example.com", "role": "admin", "password": "5f4dcc3b5aa765d61d8327deb882cf99"},
-            {"id": 2, "name": "Jane Smith", "email": "jane@example.com", "role": "user", "password": "098f6bcd4621d373cade4e832627b4f6"},
-            {"id": 3, "name": "Bob Johnson", "email": "bob@example.com", "role": "user", "password": "5e884898da28047151d0e56f8dc6292773603d0d6aabbdd62a11ef721d1542d8"},
-        ]
-    
-    # Professional SQL Interface HTML
-    html_content = f"""
+_SQL_HEAD = """
     <!DOCTYPE html>
     <html lang="en">
     <head>
@@ -233,21 +688,21 @@ async def fake_sql_interface(request: Request, query: str = ""):
         <meta name="viewport" content="width=device-width, initial-scale=1.0">
         <title>Database Management System - SQL Interface</title>
         <style>
-            * {{
+            * {
                 margin: 0;
                 padding: 0;
                 box-sizing: border-box;
-            }}
+            }
             
-            body {{
+            body {
                 font-family: 'Consolas', 'Monaco', 'Courier New', monospace;
                 background: linear-gradient(135deg, #0f1724 0%, #1e293b 100%);
                 color: #ffffff;
                 min-height: 100vh;
                 padding: 20px;
-            }}
+            }
             
-            .container {{
+            .container {
                 max-width: 1200px;
                 margin: 0 auto;
                 background: rgba(30, 41, 59, 0.95);
@@ -255,79 +710,79 @@ async def fake_sql_interface(request: Request, query: str = ""):
                 border: 1px solid #374151;
                 box-shadow: 0 20px 40px rgba(0, 0, 0, 0.3);
                 overflow: hidden;
-            }}
+            }
             
-            .header {{
+            .header {
                 background: linear-gradient(90deg, #1e293b 0%, #374151 100%);
                 padding: 25px 30px;
                 border-bottom: 2px solid #ef4444;
                 display: flex;
                 justify-content: space-between;
                 align-items: center;
-            }}
+            }
             
-            .header h1 {{
+            .header h1 {
                 color: #ef4444;
                 font-size: 1.8rem;
                 font-weight: bold;
                 text-shadow: 0 0 10px rgba(239, 68, 68, 0.3);
-            }}
+            }
             
-            .header .status {{
+            .header .status {
                 display: flex;
                 align-items: center;
                 gap: 10px;
-            }}
+            }
             
-            .status-indicator {{
+            .status-indicator {
                 width: 12px;
                 height: 12px;
                 background: #10b981;
                 border-radius: 50%;
                 animation: pulse 2s infinite;
-            }}
+            }
             
-            @keyframes pulse {{
-                0% {{ opacity: 1; }}
-                50% {{ opacity: 0.5; }}
-                100% {{ opacity: 1; }}
-            }}
+            @keyframes pulse {
+                0% { opacity: 1; }
+                50% { opacity: 0.5; }
+                100% { opacity: 1; }
+            }
             
-            .warning-banner {{
+            .warning-banner {
                 background: rgba(239, 68, 68, 0.1);
                 border: 1px solid #ef4444;
                 padding: 15px 30px;
                 text-align: center;
                 color: #ef4444;
                 font-weight: bold;
-            }}
+            }
             
-            .main-content {{
+            .main-content {
                 padding: 30px;
-            }}
+            }
             
-            .sql-interface {{
+            .sql-interface {
                 background: rgba(15, 23, 36, 0.9);
                 border: 1px solid #374151;
                 border-radius: 10px;
                 padding: 25px;
                 margin-bottom: 30px;
-            }}
+            }
             
-            .sql-title {{
+            .sql-title {
                 color: #f59e0b;
                 font-size: 1.3rem;
                 margin-bottom: 20px;
                 display: flex;
                 align-items: center;
                 gap: 10px;
-            }}
+            }
             
-            .query-form {{
+            .query-form {
                 margin-bottom: 25px;
-            }}
+            }
             
-            .query-input {{
+            .query-input {
                 width: 100%;
                 background: rgba(30, 41, 59, 0.9);
                 border: 1px solid #4b5563;
@@ -338,15 +793,15 @@ async def fake_sql_interface(request: Request, query: str = ""):
                 font-size: 14px;
                 resize: vertical;
                 min-height: 100px;
-            }}
+            }
             
-            .query-input:focus {{
+            .query-input:focus {
                 outline: none;
                 border-color: #ef4444;
                 box-shadow: 0 0 0 3px rgba(239, 68, 68, 0.1);
-            }}
+            }
             
-            .execute-btn {{
+            .execute-btn {
                 background: #ef4444;
                 color: white;
                 border: none;
@@ -357,122 +812,122 @@ async def fake_sql_interface(request: Request, query: str = ""):
                 font-weight: 600;
                 transition: all 0.3s ease;
                 margin-top: 15px;
-            }}
+            }
             
-            .execute-btn:hover {{
+            .execute-btn:hover {
                 background: #dc2626;
                 transform: translateY(-2px);
                 box-shadow: 0 5px 15px rgba(239, 68, 68, 0.3);
-            }}
+            }
             
-            .results-section {{
+            .results-section {
                 margin-top: 25px;
-            }}
+            }
             
-            .results-table {{
+            .results-table {
                 width: 100%;
                 border-collapse: collapse;
                 background: rgba(15, 23, 36, 0.9);
                 border-radius: 8px;
                 overflow: hidden;
                 border: 1px solid #374151;
-            }}
+            }
             
-            .results-table th {{
+            .results-table th {
                 background: #374151;
                 color: #f59e0b;
                 padding: 15px;
                 text-align: left;
                 font-weight: 600;
                 border-bottom: 2px solid #ef4444;
-            }}
+            }
             
-            .results-table td {{
+            .results-table td {
                 padding: 12px 15px;
                 border-bottom: 1px solid #374151;
                 color: #e5e7eb;
-            }}
+            }
             
-            .results-table tr:hover {{
+            .results-table tr:hover {
                 background: rgba(239, 68, 68, 0.05);
-            }}
+            }
             
-            .attack-alert {{
+            .attack-alert {
                 background: rgba(239, 68, 68, 0.1);
                 border: 2px solid #ef4444;
                 border-radius: 10px;
                 padding: 20px;
                 margin: 20px 0;
                 text-align: center;
-            }}
+            }
             
-            .attack-alert h3 {{
+            .attack-alert h3 {
                 color: #ef4444;
                 margin-bottom: 10px;
                 font-size: 1.2rem;
-            }}
+            }
             
-            .attack-alert p {{
+            .attack-alert p {
                 color: #94a3b8;
                 margin-bottom: 5px;
-            }}
+            }
             
-            .info-section {{
+            .info-section {
                 background: rgba(59, 130, 246, 0.1);
                 border: 1px solid #3b82f6;
                 border-radius: 10px;
                 padding: 20px;
                 margin-top: 20px;
-            }}
+            }
             
-            .info-section h3 {{
+            .info-section h3 {
                 color: #3b82f6;
                 margin-bottom: 15px;
                 font-size: 1.1rem;
-            }}
+            }
             
-            .info-section ul {{
+            .info-section ul {
                 color: #94a3b8;
                 margin-left: 20px;
                 line-height: 1.6;
-            }}
+            }
             
-            .info-section li {{
+            .info-section li {
                 margin-bottom: 5px;
-            }}
+            }
             
-            .footer {{
+            .footer {
                 text-align: center;
                 padding: 20px;
                 color: #6b7280;
                 border-top: 1px solid #374151;
                 background: rgba(15, 23, 36, 0.9);
-            }}
+            }
             
-            .footer a {{
+            .footer a {
                 color: #ef4444;
                 text-decoration: none;
-            }}
+            }
             
-            .footer a:hover {{
+            .footer a:hover {
                 text-decoration: underline;
-            }}
+            }
             
-            @media (max-width: 768px) {{
-                .header {{
+            @media (max-width: 768px) {
+                .header {
                     flex-direction: column;
                     gap: 15px;
                     text-align: center;
-                }}
+                }
                 
-                .main-content {{
+                .main-content {
                     padding: 20px;
-                }}
+                }
                 
-                .results-table {{
+                .results-table {
                     font-size: 0.9rem;
-                }}
-            }}
+                }
+            }
         </style>
     </head>
     <body>
@@ -502,26 +957,61 @@ async def fake_sql_interface(request: Request, query: str = ""):
                                 name="query" 
                                 class="query-input" 
                                 placeholder="Enter your SQL query here...&#10;Example: SELECT * FROM users&#10;Example: 1 UNION SELECT * FROM users"
-                            >{query}</textarea>
+                            >""".encode()
+
+_SQL_FORM_TAIL = """</textarea>
                             <button type="submit" class="execute-btn">▶️ Execute Query</button>
                         </form>
                     </div>
-    """
-    
-    if query:
-        html_content += """
+    """.encode()
+
+_SQL_TAIL = """
+                    <div class="info-section">
+                        <h3>ℹ️ About This Interface</h3>
+                        <ul>
+                            <li>This is a simulated SQL database interface for educational purposes</li>
+                            <li>Try SQL injection attacks like: <code>1 UNION SELECT * FROM users</code></li>
+                            <li>Common injection patterns: UNION, SELECT, INSERT, UPDATE, DELETE</li>
+                            <li>All attacks are logged and analyzed for security research</li>
+                            <li>No real data is accessed or modified</li>
+                        </ul>
+                    </div>
+                </div>
+                
+                <div style="text-align: center; margin-top: 30px;">
+                    <p style="color: #6b7280; margin-bottom: 15px;">
+                        🛡️ AI Cybersecurity Honeypot - Educational Security Research Platform
+                    </p>
+                    <div style="display: flex; justify-content: center; gap: 20px; flex-wrap: wrap;">
+                        <a href="/honeypots/login" style="color: #ef4444;">Login Honeypot</a>
+                        <a href="/honeypots/file" style="color: #ef4444;">File Honeypot</a>
+                        <a href="/analytics-page" style="color: #ef4444;">Analytics</a>
+                        <a href="/overview" style="color: #ef4444;">System Overview</a>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="footer">
+                <p>⚠️ Educational Use Only - Do not use real credentials or sensitive data</p>
+            </div>
+        </div>
+    </body>
+    </html>
+    """.encode()
+
+# Results section of the SQL page, compiled once; autoescape covers the
+# echoed query
+_sql_env = jinja2.Environment(autoescape=True)
+_SQL_RESULTS = _sql_env.from_string("""
                     <div class="results-section">
-        """
-        
-        if attack_detected:
-            html_content += f"""
+        {% if attack_detected %}
                         <div class="attack-alert">
                             <h3>🚨 SQL Injection Attack Detected!</h3>
-                            <p><strong>Query:</strong> {query}</p>
+                            <p><strong>Query:</strong> {{ query }}</p>
                             <p><strong>Attack Type:</strong> SQL Injection</p>
                             <p><strong>Severity:</strong> High</p>
                             <p><strong>Confidence:</strong> 90%</p>
-                            <p><strong>Timestamp:</strong> {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}</p>
+                            <p><strong>Timestamp:</strong> {{ now }}</p>
                         </div>
                         
                         <h3 style="color: #f59e0b; margin: 20px 0 15px 0;">📊 Query Results</h3>
@@ -536,98 +1026,83 @@ async def fake_sql_interface(request: Request, query: str = ""):
                                 </tr>
                             </thead>
                             <tbody>
-            """
-            
-            for row in fake_results:
-                html_content += f"""
+            {% for row in fake_results %}
                                 <tr>
-                                    <td>{row['id']}</td>
-                                    <td>{row['name']}</td>
-                                    <td>{row['email']}</td>
-                                    <td>{row['role']}</td>
-                                    <td style="font-family: monospace; font-size: 0.8rem;">{row['password']}</td>
+                                    <td>{{ row.id }}</td>
+                                    <td>{{ row.name }}</td>
+                                    <td>{{ row.email }}</td>
+                                    <td>{{ row.role }}</td>
+                                    <td style="font-family: monospace; font-size: 0.8rem;">{{ row.password }}</td>
                                 </tr>
-                """
-            
-            html_content += """
+                {% endfor %}
                             </tbody>
                         </table>
                         <p style="color: #94a3b8; margin-top: 15px; font-style: italic;">
                             ⚠️ This data was extracted using SQL injection - this would be a critical security vulnerability!
                         </p>
-            """
-        else:
-            html_content += f"""
+            {% else %}
                         <div style="background: rgba(16, 185, 129, 0.1); border: 1px solid #10b981; border-radius: 10px; padding: 20px; text-align: center;">
                             <h3 style="color: #10b981; margin-bottom: 10px;">✅ Query Executed Successfully</h3>
-                            <p style="color: #94a3b8;"><strong>Query:</strong> {query}</p>
+                            <p style="color: #94a3b8;"><strong>Query:</strong> {{ query }}</p>
                             <p style="color: #94a3b8;">No malicious patterns detected.</p>
                         </div>
-            """
-        
-        html_content += """
+            {% endif %}
                     </div>
-        """
+        """)
+
+# Fake rows "leaked" by UNION SELECT probes
+_FAKE_USERS = [
+    {"id": 1, "name": "John Doe", "email": "john@example.com", "role": "admin", "password": "5f4dcc3b5aa765d61d8327deb882cf99"},
+    {"id": 2, "name": "Jane Smith", "email": "jane@example.com", "role": "user", "password": "098f6bcd4621d373cade4e832627b4f6"},
+    {"id": 3, "name": "Bob Johnson", "email": "bob@example.com", "role": "user", "password": "5e884898da28047151d0e56f8dc6292773603d0d6aabbdd62a11ef721d1542d8"},
+]
+
+@app.get("/honeypots/sql", response_class=HTMLResponse)
+async def fake_sql_interface(request: Request, query: str = ""):
+    """Professional SQL database interface honeypot"""
+    client_ip, user_agent = _client_info(request)
     
-    html_content += """
-                    <div class="info-section">
-                        <h3>ℹ️ About This Interface</h3>
-                        <ul>
-                            <li>This is a simulated SQL database interface for educational purposes</li>
-                            <li>Try SQL injection attacks like: <code>1 UNION SELECT * FROM users</code></li>
-                            <li>Common injection patterns: UNION, SELECT, INSERT, UPDATE, DELETE</li>
-                            <li>All attacks are logged and analyzed for security research</li>
-                            <li>No real data is accessed or modified</li>
-                        </ul>
-                    </div>
-                </div>
-                
-                <div style="text-align: center; margin-top: 30px;">
-                    <p style="color: #6b7280; margin-bottom: 15px;">
-                        🛡️ AI Cybersecurity Honeypot - Educational Security Research Platform
-                    </p>
-                    <div style="display: flex; justify-content: center; gap: 20px; flex-wrap: wrap;">
-                        <a href="/honeypots/login" style="color: #ef4444;">Login Honeypot</a>
-                        <a href="/honeypots/file" style="color: #ef4444;">File Honeypot</a>
-                        <a href="/analytics-page" style="color: #ef4444;">Analytics</a>
-                        <a href="/overview" style="color: #ef4444;">System Overview</a>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="footer">
-                <p>⚠️ Educational Use Only - Do not use real credentials or sensitive data</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    # Analyze for SQL injection
+    attack_detected = is_sql_injection(query)
+    attack_type = "sql_injection" if attack_detected else None
     
-    return HTMLResponse(content=html_content)
-
-@app.get("/honeypots/dashboard", response_class=HTMLResponse)
-async def fake_dashboard(request: Request):
-    """Simulate an admin dashboard"""
-    client_ip = request.client.host
-    user_agent = request.headers.get("user-agent", "")
+    # Record the attack
+    attack = Attack(
+        id=_NEXT_ID(),
+        ts_ms=time.time_ns() // 1_000_000,
+        source_ip=client_ip,
+        user_agent=user_agent,
+        method="GET",
+        endpoint="/honeypots/sql",
+        attack_type=attack_type,
+        severity="high" if attack_detected else "low",
+        confidence=0.9 if attack_detected else 0.1,
+        anomaly_score=_rand(0.8, 0.95) if attack_detected else _rand(0.1, 0.3),
+        is_anomaly=attack_detected,
+        extra={"query": query}
+    )
+    log_attack(attack)
     
-    # Record dashboard access
-    attack = {
-        "id": len(attacks_db) + 1,
-        "timestamp": datetime.utcnow().isoformat(),
-        "source_ip": client_ip,
-        "user_agent": user_agent,
-        "method": "GET",
-        "endpoint": "/honeypots/dashboard",
-        "attack_type": "dashboard_access",
-        "severity": "medium",
-        "confidence": 0.7,
-        "anomaly_score": random.uniform(0.4, 0.6),
-        "is_anomaly": True,
-    }
-    attacks_db.append(attack)
+    # Fake rows are only "leaked" to UNION SELECT probes
+    lowered = query.lower()
+    leak_rows = attack_detected and "union" in lowered and "select" in lowered
+    
+    # Professional SQL Interface HTML
+    parts = [_SQL_HEAD, _h(query).encode(), _SQL_FORM_TAIL]
+    
+    if query:
+        parts.append(_SQL_RESULTS.render(
+            query=query,
+            attack_detected=attack_detected,
+            fake_results=_FAKE_USERS if leak_rows else (),
+            now=_NOW_HUMAN
+        ).encode())
+    
+    parts.append(_SQL_TAIL)
     
-    html_content = """
+    return HTMLResponse(content=b"".join(parts))
+
+_DASHBOARD_HEAD = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -654,9 +1129,15 @@ async def fake_dashboard(request: Request):
             <div class="section">
                 <h2>📊 System Overview</h2>
                 <p><strong>Status:</strong> <span class="success">Operational</span></p>
-                <p><strong>Total Attacks Logged:</strong> """ + str(len(attacks_db)) + """</p>
-                <p><strong>Your IP:</strong> """ + client_ip + """</p>
-                <p><strong>Access Time:</strong> """ + datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S") + """</p>
+                <p><strong>Total Attacks Logged:</strong> """.encode()
+
+_DASHBOARD_IP = """</p>
+                <p><strong>Your IP:</strong> """.encode()
+
+_DASHBOARD_TIME = """</p>
+                <p><strong>Access Time:</strong> """.encode()
+
+_DASHBOARD_TAIL = """</p>
             </div>
             
             <div class="section">
@@ -689,60 +1170,52 @@ async def fake_dashboard(request: Request):
         </div>
     </body>
     </html>
-    """
-    
-    return HTMLResponse(content=html_content)
+    """.encode()
 
-@app.get("/honeypots/file", response_class=HTMLResponse)
-async def fake_file_access(request: Request, path: str = ""):
-    """Simulate file access vulnerabilities"""
-    client_ip = request.client.host
-    user_agent = request.headers.get("user-agent", "")
-    
-    # Analyze for directory traversal
-    is_traversal = any(pattern in path.lower() for pattern in ["../", "..\\", "/etc/passwd", "/windows/system32"])
+@app.get("/honeypots/dashboard", response_class=HTMLResponse)
+async def fake_dashboard(request: Request):
+    """Simulate an admin dashboard"""
+    client_ip, user_agent = _client_info(request)
     
-    attack = {
-        "id": len(attacks_db) + 1,
-        "timestamp": datetime.utcnow().isoformat(),
-        "source_ip": client_ip,
-        "user_agent": user_agent,
-        "method": "GET",
-        "endpoint": "/honeypots/file",
-        "attack_type": "directory_traversal" if is_traversal else "normal",
-        "severity": "critical" if is_traversal else "low",
-        "confidence": 0.9 if is_traversal else 0.1,
-        "anomaly_score": random.uniform(0.85, 0.95) if is_traversal else random.uniform(0.1, 0.3),
-        "is_anomaly": is_traversal,
-        "path": path
-    }
+    # Record dashboard access
+    attack = Attack(
+        id=_NEXT_ID(),
+        ts_ms=time.time_ns() // 1_000_000,
+        source_ip=client_ip,
+        user_agent=user_agent,
+        method="GET",
+        endpoint="/honeypots/dashboard",
+        attack_type="dashboard_access",
+        severity="medium",
+        confidence=0.7,
+        anomaly_score=_rand(0.4, 0.6),
+        is_anomaly=True
+    )
+    log_attack(attack)
     
-    attacks_db.append(attack)
+    html_content = b"".join((
+        _DASHBOARD_HEAD, str(_logged_attack_count()).encode(),
+        _DASHBOARD_IP, client_ip.encode(),
+        _DASHBOARD_TIME, _NOW_HUMAN.encode(),
+        _DASHBOARD_TAIL
+    ))
     
-    if path:
-        fake_files = {
-            "/etc/passwd": "root:x:0:0:root:/root:/bin/bash\nbin:x:1:1:bin:/bin:/sbin/nologin",
-            "/etc/hosts": "127.0.0.1 localhost\n::1 localhost",
-            "/windows/system32/drivers/etc/hosts": "127.0.0.1 localhost"
-        }
-        
-        content = fake_files.get(path, "File not found or access denied")
-        
-        # Create HTML response for file access
-        html_content = f"""
+    return HTMLResponse(content=html_content)
+
+_FILE_HEAD = """
         <!DOCTYPE html>
         <html>
         <head>
             <title>File Access - Honeypot</title>
             <style>
-                body {{ font-family: monospace; background: #0f1724; color: #fff; padding: 20px; }}
-                .container {{ max-width: 800px; margin: 0 auto; }}
-                .header {{ background: #1e293b; padding: 20px; border-radius: 10px; margin-bottom: 20px; }}
-                .warning {{ background: rgba(239, 68, 68, 0.1); border: 1px solid #ef4444; padding: 15px; border-radius: 8px; margin: 20px 0; }}
-                .file-content {{ background: #1e293b; padding: 20px; border-radius: 8px; white-space: pre-wrap; font-family: monospace; }}
-                .attack-alert {{ background: rgba(239, 68, 68, 0.2); border: 2px solid #ef4444; padding: 20px; border-radius: 10px; text-align: center; margin: 20px 0; }}
-                .nav {{ text-align: center; margin-top: 30px; }}
-                .nav a {{ color: #ef4444; text-decoration: none; margin: 0 10px; }}
+                body { font-family: monospace; background: #0f1724; color: #fff; padding: 20px; }
+                .container { max-width: 800px; margin: 0 auto; }
+                .header { background: #1e293b; padding: 20px; border-radius: 10px; margin-bottom: 20px; }
+                .warning { background: rgba(239, 68, 68, 0.1); border: 1px solid #ef4444; padding: 15px; border-radius: 8px; margin: 20px 0; }
+                .file-content { background: #1e293b; padding: 20px; border-radius: 8px; white-space: pre-wrap; font-family: monospace; }
+                .attack-alert { background: rgba(239, 68, 68, 0.2); border: 2px solid #ef4444; padding: 20px; border-radius: 10px; text-align: center; margin: 20px 0; }
+                .nav { text-align: center; margin-top: 30px; }
+                .nav a { color: #ef4444; text-decoration: none; margin: 0 10px; }
             </style>
         </head>
         <body>
@@ -753,7 +1226,9 @@ async def fake_file_access(request: Request, path: str = ""):
                 </div>
                 
                 <form method="GET" style="margin-bottom: 20px;">
-                    <input type="text" name="path" placeholder="Enter file path..." value="{path}" style="width: 70%; padding: 10px; background: #1e293b; border: 1px solid #374151; color: #fff; border-radius: 5px;">
+                    <input type="text" name="path" placeholder="Enter file path..." value=\"""".encode()
+
+_FILE_FORM_TAIL = """\" style="width: 70%; padding: 10px; background: #1e293b; border: 1px solid #374151; color: #fff; border-radius: 5px;">
                     <button type="submit" style="padding: 10px 20px; background: #ef4444; color: white; border: none; border-radius: 5px; margin-left: 10px;">Access File</button>
                 </form>
                 
@@ -763,21 +1238,13 @@ async def fake_file_access(request: Request, path: str = ""):
                     <a href="?path=../../../etc/passwd" style="color: #ef4444; margin: 0 5px;">../../../etc/passwd</a>
                     <a href="?path=/windows/system32/hosts" style="color: #ef4444; margin: 0 5px;">/windows/system32/hosts</a>
                 </div>
-        """
-        
-        if is_traversal:
-            html_content += f"""
-                <div class="attack-alert">
-                    <h3>🚨 Directory Traversal Attack Detected!</h3>
-                    <p><strong>Path:</strong> {path}</p>
-                    <p><strong>Attack Type:</strong> Directory Traversal</p>
-                    <p><strong>Severity:</strong> Critical</p>
-                </div>
-            """
-        
-        html_content += f"""
+        """.encode()
+
+_FILE_CONTENT_OPEN = """
                 <h3>📄 File Content:</h3>
-                <div class="file-content">{content}</div>
+                <div class="file-content">""".encode()
+
+_FILE_TAIL = """</div>
                 
                 <div class="nav">
                     <a href="/honeypots/login">Login Honeypot</a>
@@ -788,12 +1255,9 @@ async def fake_file_access(request: Request, path: str = ""):
             </div>
         </body>
         </html>
-        """
-        
-        return HTMLResponse(content=html_content)
-    else:
-        # Create HTML response for no path
-        html_content = """
+        """.encode()
+
+_FILE_INDEX_HTML = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -848,194 +1312,257 @@ async def fake_file_access(request: Request, path: str = ""):
         </body>
         </html>
         """
-        
-        return HTMLResponse(content=html_content)
+_FILE_INDEX_PAGE = _static_page(_FILE_INDEX_HTML)
 
-@app.get("/analytics-page", response_class=HTMLResponse)
-async def analytics_page():
-    """HTML analytics dashboard page"""
-    total_attacks = len(attacks_db)
-    unique_attackers = len(set(attack["source_ip"] for attack in attacks_db))
-    anomalies = len([a for a in attacks_db if a["is_anomaly"]])
+@app.get("/honeypots/file", response_class=HTMLResponse)
+async def fake_file_access(request: Request, path: str = ""):
+    """Simulate file access vulnerabilities"""
+    client_ip, user_agent = _client_info(request)
     
-    # Attack types breakdown
-    attack_types = {}
-    severity_breakdown = {}
-    for attack in attacks_db:
-        attack_type = attack["attack_type"]
-        severity = attack["severity"]
-        attack_types[attack_type] = attack_types.get(attack_type, 0) + 1
-        severity_breakdown[severity] = severity_breakdown.get(severity, 0) + 1
+    # Analyze for directory traversal
+    is_traversal = is_traversal_attempt(path)
+    
+    attack = Attack(
+        id=_NEXT_ID(),
+        ts_ms=time.time_ns() // 1_000_000,
+        source_ip=client_ip,
+        user_agent=user_agent,
+        method="GET",
+        endpoint="/honeypots/file",
+        attack_type="directory_traversal" if is_traversal else "normal",
+        severity="critical" if is_traversal else "low",
+        confidence=0.9 if is_traversal else 0.1,
+        anomaly_score=_rand(0.85, 0.95) if is_traversal else _rand(0.1, 0.3),
+        is_anomaly=is_traversal,
+        extra={"path": path}
+    )
     
-    # Recent attacks for display
-    recent_attacks = attacks_db[-10:] if attacks_db else []
+    log_attack(attack)
     
-    html_content = f"""
+    if path:
+        fake_files = {
+            "/etc/passwd": "root:x:0:0:root:/root:/bin/bash\nbin:x:1:1:bin:/bin:/sbin/nologin",
+            "/etc/hosts": "127.0.0.1 localhost\n::1 localhost",
+            "/windows/system32/drivers/etc/hosts": "127.0.0.1 localhost"
+        }
+        
+        content = fake_files.get(path, "File not found or access denied")
+        
+        # Create HTML response for file access
+        path_esc = _h(path)
+        parts = [_FILE_HEAD, path_esc.encode(), _FILE_FORM_TAIL]
+        
+        if is_traversal:
+            parts.append(f"""
+                <div class="attack-alert">
+                    <h3>🚨 Directory Traversal Attack Detected!</h3>
+                    <p><strong>Path:</strong> {path_esc}</p>
+                    <p><strong>Attack Type:</strong> Directory Traversal</p>
+                    <p><strong>Severity:</strong> Critical</p>
+                </div>
+            """.encode())
+        
+        parts += (_FILE_CONTENT_OPEN, content.encode(), _FILE_TAIL)
+        
+        return HTMLResponse(content=b"".join(parts))
+    else:
+        # Create HTML response for no path
+        return _serve_static(request, _FILE_INDEX_PAGE)
+
+# Analytics views are cached briefly; an entry is dropped as soon as a new
+# attack is stored, so the cache only absorbs refresh/poll bursts
+_VIEW_CACHE_TTL = 5.0
+_VIEW_CACHE_KEYS = 64
+
+def cached_view(ttl: float = _VIEW_CACHE_TTL):
+    """Cache an endpoint's result per query parameters until the TTL
+    lapses or attacks_db changes"""
+    def decorator(func):
+        cache: Dict[tuple, tuple] = {}
+        
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            key = tuple(sorted(kwargs.items()))
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit is not None and hit[1] == attacks_db.total and now - hit[0] < ttl:
+                return hit[2]
+            result = await func(**kwargs)
+            if len(cache) >= _VIEW_CACHE_KEYS:
+                cache.clear()
+            cache[key] = (now, attacks_db.total, result)
+            return result
+        
+        return wrapper
+    return decorator
+
+# Static head, CSS and banner of the analytics page, encoded once
+_ANALYTICS_PREFIX = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>Security Analytics Dashboard</title>
         <style>
-            body {{ 
+            body { 
                 font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
                 margin: 0; 
                 padding: 20px; 
                 background: linear-gradient(135deg, #0f1724 0%, #1e293b 100%);
                 color: #ffffff;
                 min-height: 100vh;
-            }}
-            .container {{ 
+            }
+            .container { 
                 max-width: 1200px; 
                 margin: 0 auto; 
-            }}
-            .header {{ 
+            }
+            .header { 
                 text-align: center; 
                 margin-bottom: 30px; 
-            }}
-            .header h1 {{ 
+            }
+            .header h1 { 
                 color: #ef4444; 
                 margin: 0; 
                 font-size: 2.5rem;
                 text-shadow: 0 0 10px rgba(239, 68, 68, 0.3);
-            }}
-            .header p {{ 
+            }
+            .header p { 
                 color: #94a3b8; 
                 margin: 10px 0 0 0;
                 font-size: 1.1rem;
-            }}
-            .stats-grid {{ 
+            }
+            .stats-grid { 
                 display: grid; 
                 grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); 
                 gap: 20px; 
                 margin-bottom: 30px; 
-            }}
-            .stat-card {{ 
+            }
+            .stat-card { 
                 background: rgba(30, 41, 59, 0.8); 
                 padding: 25px; 
                 border-radius: 12px; 
                 border: 1px solid #374151;
                 box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
                 transition: transform 0.3s ease;
-            }}
-            .stat-card:hover {{ 
+            }
+            .stat-card:hover { 
                 transform: translateY(-5px);
                 box-shadow: 0 8px 15px rgba(0, 0, 0, 0.4);
-            }}
-            .stat-number {{ 
+            }
+            .stat-number { 
                 font-size: 2.5rem; 
                 font-weight: bold; 
                 color: #ef4444; 
                 margin: 0;
                 text-shadow: 0 0 10px rgba(239, 68, 68, 0.3);
-            }}
-            .stat-label {{ 
+            }
+            .stat-label { 
                 color: #94a3b8; 
                 font-size: 1rem; 
                 margin: 5px 0 0 0;
-            }}
-            .charts-grid {{ 
+            }
+            .charts-grid { 
                 display: grid; 
                 grid-template-columns: 1fr 1fr; 
                 gap: 20px; 
                 margin-bottom: 30px; 
-            }}
-            .chart-card {{ 
+            }
+            .chart-card { 
                 background: rgba(30, 41, 59, 0.8); 
                 padding: 25px; 
                 border-radius: 12px; 
                 border: 1px solid #374151;
                 box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-            }}
-            .chart-title {{ 
+            }
+            .chart-title { 
                 color: #f59e0b; 
                 font-size: 1.3rem; 
                 margin: 0 0 20px 0;
                 font-weight: 600;
-            }}
-            .attack-type {{ 
+            }
+            .attack-type { 
                 display: flex; 
                 justify-content: space-between; 
                 align-items: center; 
                 padding: 10px 0; 
                 border-bottom: 1px solid #374151;
-            }}
-            .attack-type:last-child {{ 
+            }
+            .attack-type:last-child { 
                 border-bottom: none; 
-            }}
-            .attack-name {{ 
+            }
+            .attack-name { 
                 color: #ffffff; 
                 font-weight: 500;
-            }}
-            .attack-count {{ 
+            }
+            .attack-count { 
                 color: #ef4444; 
                 font-weight: bold;
                 background: rgba(239, 68, 68, 0.1);
                 padding: 5px 10px;
                 border-radius: 6px;
-            }}
-            .severity-item {{ 
+            }
+            .severity-item { 
                 display: flex; 
                 justify-content: space-between; 
                 align-items: center; 
                 padding: 10px 0; 
                 border-bottom: 1px solid #374151;
-            }}
-            .severity-item:last-child {{ 
+            }
+            .severity-item:last-child { 
                 border-bottom: none; 
-            }}
-            .severity-name {{ 
+            }
+            .severity-name { 
                 color: #ffffff; 
                 font-weight: 500;
                 text-transform: capitalize;
-            }}
-            .severity-count {{ 
+            }
+            .severity-count { 
                 font-weight: bold;
                 padding: 5px 10px;
                 border-radius: 6px;
-            }}
-            .critical {{ color: #ef4444; background: rgba(239, 68, 68, 0.1); }}
-            .high {{ color: #f59e0b; background: rgba(245, 158, 11, 0.1); }}
-            .medium {{ color: #3b82f6; background: rgba(59, 130, 246, 0.1); }}
-            .low {{ color: #10b981; background: rgba(16, 185, 129, 0.1); }}
-            .recent-attacks {{ 
+            }
+            .critical { color: #ef4444; background: rgba(239, 68, 68, 0.1); }
+            .high { color: #f59e0b; background: rgba(245, 158, 11, 0.1); }
+            .medium { color: #3b82f6; background: rgba(59, 130, 246, 0.1); }
+            .low { color: #10b981; background: rgba(16, 185, 129, 0.1); }
+            .recent-attacks { 
                 background: rgba(30, 41, 59, 0.8); 
                 padding: 25px; 
                 border-radius: 12px; 
                 border: 1px solid #374151;
                 box-shadow: 0 4px 6px rgba(0, 0, 0, 0.3);
-            }}
-            .attack-item {{ 
+            }
+            .attack-item { 
                 display: flex; 
                 justify-content: space-between; 
                 align-items: center; 
                 padding: 15px 0; 
                 border-bottom: 1px solid #374151;
-            }}
-            .attack-item:last-child {{ 
+            }
+            .attack-item:last-child { 
                 border-bottom: none; 
-            }}
-            .attack-info {{ 
+            }
+            .attack-info { 
                 flex: 1; 
-            }}
-            .attack-type-badge {{ 
+            }
+            .attack-type-badge { 
                 display: inline-block; 
                 padding: 4px 8px; 
                 border-radius: 4px; 
                 font-size: 0.8rem; 
                 font-weight: bold; 
                 margin-right: 10px;
-            }}
-            .attack-time {{ 
+            }
+            .attack-time { 
                 color: #94a3b8; 
                 font-size: 0.9rem; 
                 margin-top: 5px;
-            }}
-            .attack-ip {{ 
+            }
+            .attack-ip { 
                 color: #f59e0b; 
                 font-family: monospace; 
                 font-weight: bold;
-            }}
-            .refresh-btn {{ 
+            }
+            .refresh-btn { 
                 background: #ef4444; 
                 color: white; 
                 border: none; 
@@ -1046,29 +1573,29 @@ async def analytics_page():
                 font-weight: 600;
                 transition: background 0.3s ease;
                 margin: 20px 0;
-            }}
-            .refresh-btn:hover {{ 
+            }
+            .refresh-btn:hover { 
                 background: #dc2626; 
-            }}
-            .warning-box {{ 
+            }
+            .warning-box { 
                 background: rgba(239, 68, 68, 0.1); 
                 border: 1px solid #ef4444; 
                 padding: 15px; 
                 border-radius: 8px; 
                 margin-bottom: 20px;
                 text-align: center;
-            }}
-            .warning-box strong {{ 
+            }
+            .warning-box strong { 
                 color: #ef4444; 
-            }}
-            @media (max-width: 768px) {{
-                .charts-grid {{ 
+            }
+            @media (max-width: 768px) {
+                .charts-grid { 
                     grid-template-columns: 1fr; 
-                }}
-                .stats-grid {{ 
+                }
+                .stats-grid { 
                     grid-template-columns: 1fr; 
-                }}
-            }}
+                }
+            }
         </style>
     </head>
     <body>
@@ -1084,90 +1611,22 @@ async def analytics_page():
             
             <button class="refresh-btn" onclick="window.location.reload()">🔄 Refresh Data</button>
             
-            <div class="stats-grid">
-                <div class="stat-card">
-                    <div class="stat-number">{total_attacks}</div>
-                    <div class="stat-label">Total Attacks</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{unique_attackers}</div>
-                    <div class="stat-label">Unique Attackers</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{anomalies}</div>
-                    <div class="stat-label">Anomalies Detected</div>
-                </div>
-                <div class="stat-card">
-                    <div class="stat-number">{len([a for a in attacks_db if a.get('severity') in ['high', 'critical']])}</div>
-                    <div class="stat-label">High/Critical Threats</div>
-                </div>
-            </div>
-            
-            <div class="charts-grid">
-                <div class="chart-card">
-                    <h3 class="chart-title">🎯 Attack Types</h3>
-                    <div class="attack-types">
-    """
-    
-    for attack_type, count in attack_types.items():
-        html_content += f"""
-                        <div class="attack-type">
-                            <span class="attack-name">{attack_type.replace('_', ' ').title()}</span>
-                            <span class="attack-count">{count}</span>
-                        </div>
-        """
-    
-    html_content += f"""
-                    </div>
-                </div>
-                
-                <div class="chart-card">
-                    <h3 class="chart-title">⚠️ Severity Distribution</h3>
-                    <div class="severity-breakdown">
-    """
-    
-    for severity, count in severity_breakdown.items():
-        html_content += f"""
-                        <div class="severity-item">
-                            <span class="severity-name">{severity}</span>
-                            <span class="severity-count {severity}">{count}</span>
-                        </div>
-        """
-    
-    html_content += f"""
-                    </div>
-                </div>
-            </div>
-            
-            <div class="recent-attacks">
-                <h3 class="chart-title">📋 Recent Security Events</h3>
-                <div class="attacks-list">
-    """
-    
-    if recent_attacks:
-        for attack in reversed(recent_attacks):
-            timestamp = attack.get('timestamp', '')[:19].replace('T', ' ')
-            attack_type = attack.get('attack_type', 'unknown').replace('_', ' ').title()
-            severity = attack.get('severity', 'unknown')
-            source_ip = attack.get('source_ip', 'unknown')
-            
-            html_content += f"""
-                    <div class="attack-item">
-                        <div class="attack-info">
-                            <span class="attack-type-badge {severity}">{attack_type}</span>
-                            <span class="attack-ip">{source_ip}</span>
-                            <div class="attack-time">{timestamp}</div>
-                        </div>
-                    </div>
-            """
-    else:
-        html_content += """
-                    <div style="text-align: center; color: #94a3b8; padding: 20px;">
-                        No attacks detected yet. Try accessing the honeypot endpoints!
-                    </div>
-        """
-    
-    html_content += """
+""".encode()
+
+# Dynamic part of the analytics page, compiled once from backend/templates
+_templates = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")),
+    autoescape=True,
+    auto_reload=False,
+    cache_size=-1
+)
+_ANALYTICS_TEMPLATE = _templates.get_template("analytics.html.jinja")
+
+# Breakdown rows shown per chart on the analytics page
+_ANALYTICS_TOP_K = 10
+
+# Footer and auto-refresh script
+_ANALYTICS_SUFFIX = """
                 </div>
             </div>
             
@@ -1184,93 +1643,198 @@ async def analytics_page():
         
         <script>
             // Auto-refresh every 30 seconds
-            setTimeout(() => {{
+            setTimeout(() => {
                 window.location.reload();
-            }}, 30000);
+            }, 30000);
         </script>
     </body>
     </html>
-    """
-    
-    return HTMLResponse(content=html_content)
+    """.encode()
+
+def _render_analytics_body() -> bytes:
+    """Render the dynamic middle of the analytics page"""
+    return _ANALYTICS_TEMPLATE.render(
+        total_attacks=len(attacks_db),
+        unique_attackers=attacks_db.unique_sources(),
+        anomalies=attacks_db.anomaly_count(),
+        high_critical=attacks_db.high_critical_count(),
+        # Breakdowns most frequent first, labels escaped at ingest
+        attack_types=[(attacks_db.title_html(t), c) for t, c in attacks_db.top_attack_types(_ANALYTICS_TOP_K)],
+        severities=[(attacks_db.name_html(sv), c) for sv, c in attacks_db.top_severities(_ANALYTICS_TOP_K)],
+        recent_attacks=attacks_db.display_recent(10)
+    ).encode()
+
+# Rendered at import, while attacks_db is still empty
+_ANALYTICS_EMPTY_BODY = _render_analytics_body()
+
+@cached_view()
+async def _analytics_body() -> bytes:
+    if not attacks_db:
+        return _ANALYTICS_EMPTY_BODY
+    return _render_analytics_body()
+
+@cached_view()
+async def _analytics_page_gzip() -> bytes:
+    # The whole page is compressed as one gzip member per render, since many
+    # decoders stop after the first member of a concatenated stream
+    return gzip.compress(_ANALYTICS_PREFIX + await _analytics_body() + _ANALYTICS_SUFFIX, 6)
+
+async def _stream_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+@app.get("/analytics-page", response_class=HTMLResponse)
+async def analytics_page(request: Request):
+    """HTML analytics dashboard page"""
+    headers = {"Vary": "Accept-Encoding"}
+    if _accepts_encoding(request, "gzip"):
+        headers["Content-Encoding"] = "gzip"
+        chunks = (await _analytics_page_gzip(),)
+    else:
+        chunks = (_ANALYTICS_PREFIX, await _analytics_body(), _ANALYTICS_SUFFIX)
+    # Uncompressed, the static chrome is sent as-is rather than copied into one buffer
+    return StreamingResponse(_stream_chunks(*chunks), media_type="text/html", headers=headers)
+
+_EMPTY_ANALYTICS = {
+    "total_attacks": 0,
+    "unique_attackers": 0,
+    "unique_attackers_all_time": 0,
+    "anomalies_detected": 0,
+    "active_alerts": 0,
+    "attack_types": {},
+    "severity_breakdown": {},
+    "time_range": "24 hours"
+}
 
 @app.get("/analytics")
+@cached_view()
 async def get_analytics():
     """Get analytics data"""
+    if not attacks_db:
+        return JSONResponse(content={**_EMPTY_ANALYTICS, "last_updated": _NOW_ISO})
+    
     total_attacks = len(attacks_db)
-    unique_attackers = len(set(attack["source_ip"] for attack in attacks_db))
-    anomalies = len([a for a in attacks_db if a["is_anomaly"]])
+    unique_attackers = attacks_db.unique_sources()
+    anomalies = attacks_db.anomaly_count()
     
     # Attack types breakdown
-    attack_types = {}
-    severity_breakdown = {}
-    for attack in attacks_db:
-        attack_type = attack["attack_type"]
-        severity = attack["severity"]
-        attack_types[attack_type] = attack_types.get(attack_type, 0) + 1
-        severity_breakdown[severity] = severity_breakdown.get(severity, 0) + 1
+    attack_types = attacks_db.attack_type_counts()
+    severity_breakdown = attacks_db.severity_counts()
     
-    return {
+    return JSONResponse(content={
         "total_attacks": total_attacks,
         "unique_attackers": unique_attackers,
+        "unique_attackers_all_time": attacks_db.unique_sources_all_time(),
         "anomalies_detected": anomalies,
-        "active_alerts": len([a for a in attacks_db if a["severity"] in ["high", "critical"]]),
+        "active_alerts": attacks_db.high_critical_count(),
         "attack_types": attack_types,
         "severity_breakdown": severity_breakdown,
         "time_range": "24 hours",
-        "last_updated": datetime.utcnow().isoformat()
-    }
+        "last_updated": _NOW_ISO
+    })
+
+# Larger /attacks pages are streamed in batches instead of being encoded
+# into one buffer
+_ATTACKS_STREAM_MIN = 1000
+_ATTACKS_STREAM_BATCH = 256
+
+@cached_view()
+async def _attacks_payload(limit: int) -> bytes:
+    return orjson.dumps({
+        "attacks": attacks_db.tail(limit),
+        "total_count": len(attacks_db),
+        "limit": limit
+    })
+
+async def _stream_attacks(limit: int):
+    total_count = len(attacks_db)
+    records = attacks_db.iter_tail(limit)
+    yield b'{"attacks":['
+    first = True
+    while True:
+        batch = list(itertools.islice(records, _ATTACKS_STREAM_BATCH))
+        if not batch:
+            break
+        chunk = b",".join(map(orjson.dumps, batch))
+        yield chunk if first else b"," + chunk
+        first = False
+    yield b'],"total_count":%d,"limit":%d}' % (total_count, limit)
 
 @app.get("/attacks")
 async def get_attacks(limit: int = 50):
     """Get recent attacks"""
-    recent_attacks = attacks_db[-limit:] if attacks_db else []
-    
-    return {
-        "attacks": recent_attacks,
-        "total_count": len(attacks_db),
-        "limit": limit
-    }
+    if limit > _ATTACKS_STREAM_MIN:
+        return StreamingResponse(_stream_attacks(limit), media_type="application/json")
+    return Response(content=await _attacks_payload(limit=limit), media_type="application/json")
+
+# Value tables for generated test attacks
+_GEN_ATTACK_TYPES = ("sql_injection", "xss", "brute_force", "directory_traversal", "normal")
+_GEN_SEVERITIES = ("low", "medium", "high", "critical")
+_GEN_USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "sqlmap/1.0-dev (http://sqlmap.org)",
+    "Mozilla/5.0 (compatible; Nikto/2.1.6)"
+)
+_GEN_METHODS = ("GET", "POST")
+_GEN_ENDPOINTS = (
+    "/honeypots/login",
+    "/honeypots/sql",
+    "/honeypots/file",
+    "/honeypots/admin"
+)
+_GEN_IPS = tuple(f"192.168.1.{i}" for i in range(100, 201))
 
 @app.get("/generate-attacks")
 async def generate_test_attacks(count: int = 10):
     """Generate test attacks for demonstration"""
-    attack_types = ["sql_injection", "xss", "brute_force", "directory_traversal", "normal"]
-    severities = ["low", "medium", "high", "critical"]
+    # Sample every field for the whole batch up front
+    columns = zip(
+        random.choices(_GEN_IPS, k=count),
+        random.choices(_GEN_USER_AGENTS, k=count),
+        random.choices(_GEN_METHODS, k=count),
+        random.choices(_GEN_ENDPOINTS, k=count),
+        random.choices(_GEN_ATTACK_TYPES, k=count),
+        random.choices(_GEN_SEVERITIES, k=count),
+        random.choices((True, False), k=count)
+    )
+    # One timestamp for the batch; it is generated in a single call
+    ts_ms = time.time_ns() // 1_000_000
     
-    for i in range(count):
-        attack = {
-            "id": len(attacks_db) + 1,
-            "timestamp": datetime.utcnow().isoformat(),
-            "source_ip": f"192.168.1.{random.randint(100, 200)}",
-            "user_agent": random.choice([
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                "sqlmap/1.0-dev (http://sqlmap.org)",
-                "Mozilla/5.0 (compatible; Nikto/2.1.6)"
-            ]),
-            "method": random.choice(["GET", "POST"]),
-            "endpoint": random.choice([
-                "/honeypots/login",
-                "/honeypots/sql",
-                "/honeypots/file",
-                "/honeypots/admin"
-            ]),
-            "attack_type": random.choice(attack_types),
-            "severity": random.choice(severities),
-            "confidence": random.uniform(0.1, 0.95),
-            "anomaly_score": random.uniform(0.1, 0.95),
-            "is_anomaly": random.choice([True, False])
-        }
-        attacks_db.append(attack)
+    attacks_db.extend(
+        Attack(
+            id=_NEXT_ID(),
+            ts_ms=ts_ms,
+            source_ip=source_ip,
+            user_agent=user_agent,
+            method=method,
+            endpoint=endpoint,
+            attack_type=attack_type,
+            severity=severity,
+            confidence=_rand(0.1, 0.95),
+            anomaly_score=_rand(0.1, 0.95),
+            is_anomaly=is_anomaly
+        )
+        for source_ip, user_agent, method, endpoint, attack_type, severity, is_anomaly in columns
+    )
     
-    return {
+    return JSONResponse(content={
         "message": f"Generated {count} test attacks",
         "total_attacks": len(attacks_db)
-    }
+    })
 
 if __name__ == "__main__":
     import uvicorn
-    import asyncio
-    import os
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run("simple_main:app", host="0.0.0.0", port=port, reload=False)
+    # Attack storage is in-process, so each worker keeps its own log and
+    # analytics; only raise WEB_CONCURRENCY when that split is acceptable.
+    # "auto" picks uvloop/httptools when installed (uvicorn[standard])
+    uvicorn.run(
+        "simple_main:app",
+        host="0.0.0.0",
+        port=port,
+        reload=False,
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        loop="auto",
+        http="auto",
+        access_log=False
+    )
@@ -3,32 +3,244 @@ Telemetry ingestion system for collecting and processing attack data
 """
 
 import asyncio
+import bisect
+import functools
 import json
 import logging
-from datetime import datetime
-from typing import Dict, Any, Optional, List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
-import uuid
+import re
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Tuple, Iterable, Iterator
+from sqlalchemy import func, select
+from array import array
+import itertools
+import secrets
+import time
 import hashlib
 import ipaddress
+import numpy as np
 
-from database.connection import SessionLocal
+from database.connection import AsyncSessionLocal
 from database.models import AttackEvent, AttackerFingerprint, HoneypotSession, SecurityAlert
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1)
+
+# IDs are a random per-process prefix plus per-kind counters, unique without
+# a uuid4 (and its getrandom call) per event
+_ID_PREFIX = secrets.token_hex(4)
+_REQ_COUNTER = itertools.count()
+_SESS_COUNTER = itertools.count()
+_ALERT_COUNTER = itertools.count()
+
+# Per-attacker caps so persistent sources can't grow the fingerprint cache unbounded
+_FINGERPRINT_MAX_VALUES = 256
+_FINGERPRINT_MAX_TIMINGS = 128
+
+# Fingerprints written per round trip by the periodic database sync
+_FINGERPRINT_SYNC_CHUNK = 500
+
+# Threat level for a risk score above each bound (exclusive), via bisect_left
+_THREAT_BOUNDS = (40, 60, 80)
+_THREAT_LABELS = ("low", "medium", "high", "critical")
+
+@functools.lru_cache(maxsize=10_000)
+def _normalize_ip(source_ip: str) -> str:
+    """Canonical form of an IP address, cached since attackers repeat"""
+    try:
+        return str(ipaddress.ip_address(source_ip))
+    except ValueError:
+        return source_ip
+
+# Minimum seconds between security alerts for the same source IP
+_ALERT_COOLDOWN = 300.0
+
+# Tag patterns, matched case-insensitively against the request URL
+_AUTH_RE = re.compile(r"admin|login|auth", re.I)
+_API_RE = re.compile(r"api|rest|json", re.I)
+_DB_RE = re.compile(r"sql|database|query", re.I)
+_FILE_RE = re.compile(r"file|upload|download", re.I)
+_TOOL_RE = re.compile(r"sqlmap|nikto|nmap|burp|zap", re.I)
+
+# Exception text patterns, checked in order: (pattern, attack_type, severity, confidence)
+_EXC_SQL_RE = re.compile(r"sql|injection|union|select", re.I)
+_EXC_XSS_RE = re.compile(r"xss|script|javascript", re.I)
+_EXC_DOS_RE = re.compile(r"timeout|connection", re.I)
+_EXCEPTION_PATTERNS = (
+    (_EXC_SQL_RE, "sql_injection", "high", 0.8),
+    (_EXC_XSS_RE, "xss", "medium", 0.7),
+    (_EXC_DOS_RE, "dos", "high", 0.6),
+)
+
+# (pattern, tag) for the URL tags, in the order tags are reported
+_URL_TAGS = (
+    (_AUTH_RE, "authentication_related"),
+    (_API_RE, "api_endpoint"),
+    (_DB_RE, "database_related"),
+    (_FILE_RE, "file_operation"),
+)
+
+# Hyperscan is optional; without it the compiled regexes are searched one by one
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+class PatternGroup:
+    """Case-insensitive patterns matched together in a single scan"""
+    
+    def __init__(self, patterns: List[re.Pattern]):
+        self.patterns = patterns
+        self.database = None
+        if hyperscan is not None:
+            self.database = hyperscan.Database()
+            self.database.compile(
+                expressions=[pattern.pattern.encode() for pattern in patterns],
+                ids=list(range(len(patterns))),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+            )
+    
+    def matches(self, text: str) -> set:
+        """Return the indexes of the patterns found in text"""
+        if self.database is None:
+            return {i for i, pattern in enumerate(self.patterns) if pattern.search(text)}
+        
+        hits = set()
+        self.database.scan(
+            text.encode("utf-8", "replace"),
+            match_event_handler=lambda pattern_id, start, end, flags, context: hits.add(pattern_id)
+        )
+        return hits
+    
+    def first(self, text: str) -> Optional[int]:
+        """Return the lowest index among the patterns found in text"""
+        if self.database is not None:
+            return min(self.matches(text), default=None)
+        
+        # Patterns are searched in order; one alternation would let an earlier
+        # match consume an overlapping hit for a higher-priority pattern
+        return next((i for i, pattern in enumerate(self.patterns) if pattern.search(text)), None)
+
+class BoundedSet:
+    """Insertion-ordered set that evicts its oldest member once full"""
+    
+    def __init__(self, items: Iterable = (), max_size: int = _FINGERPRINT_MAX_VALUES):
+        self.max_size = max_size
+        self._items = set()
+        self._order = deque()
+        for item in items:
+            self.add(item)
+    
+    def add(self, item):
+        if item in self._items:
+            return
+        if len(self._order) >= self.max_size:
+            self._items.discard(self._order.popleft())
+        self._items.add(item)
+        self._order.append(item)
+    
+    def __contains__(self, item) -> bool:
+        return item in self._items
+    
+    def __len__(self) -> int:
+        return len(self._order)
+    
+    def __iter__(self) -> Iterator:
+        return iter(self._order)
+
+@dataclass(slots=True)
+class SessionState:
+    """In-memory tracking state for a honeypot session"""
+    session_id: str
+    source_ip: str
+    honeypot_type: str
+    start_time: datetime
+    request_count: int = 0
+    endpoints: set = field(default_factory=set)
+    last_activity: float = 0.0  # time.monotonic()
+
+@dataclass(slots=True)
+class Fingerprint:
+    """Cached behavioral fingerprint for one attacker"""
+    attack_patterns: Counter = field(default_factory=Counter)
+    user_agents: BoundedSet = field(default_factory=BoundedSet)
+    endpoints: BoundedSet = field(default_factory=BoundedSet)
+    # Timing patterns as parallel arrays of UTC epoch seconds and response
+    # times, usable directly by numpy via the buffer protocol
+    timestamps: array = field(default_factory=lambda: array("d"))
+    response_times: array = field(default_factory=lambda: array("d"))
+    total_requests: int = 0
+    unique_endpoints: int = 0
+    risk_score: float = 0.0
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    # False until merged with (or written as) the database record
+    reconciled: bool = False
+    
+    @classmethod
+    def from_record(cls, record: AttackerFingerprint) -> "Fingerprint":
+        """Build a cached fingerprint from its database record"""
+        return cls(
+            attack_patterns=Counter(record.attack_patterns or {}),
+            user_agents=BoundedSet(record.user_agents or []),
+            endpoints=BoundedSet(record.common_endpoints or []),
+            total_requests=record.total_requests or 0,
+            unique_endpoints=record.unique_endpoints or 0,
+            risk_score=record.risk_score or 0.0,
+            first_seen=record.first_seen,
+            last_seen=record.last_seen,
+            reconciled=True
+        )
+    
+    def merge_record(self, record: AttackerFingerprint):
+        """Fold an existing database record into a locally created fingerprint"""
+        self.attack_patterns.update(record.attack_patterns or {})
+        user_agents = BoundedSet(record.user_agents or [])
+        endpoints = BoundedSet(record.common_endpoints or [])
+        for user_agent in self.user_agents:
+            user_agents.add(user_agent)
+        for endpoint in self.endpoints:
+            endpoints.add(endpoint)
+        self.user_agents = user_agents
+        self.endpoints = endpoints
+        self.total_requests += record.total_requests or 0
+        self.unique_endpoints = len(endpoints)
+        if record.first_seen and (self.first_seen is None or record.first_seen < self.first_seen):
+            self.first_seen = record.first_seen
+        self.reconciled = True
+
+_URL_TAG_GROUP = PatternGroup([pattern for pattern, _ in _URL_TAGS])
+_TOOL_GROUP = PatternGroup([_TOOL_RE])
+_EXCEPTION_GROUP = PatternGroup([pattern for pattern, *_ in _EXCEPTION_PATTERNS])
+
 class TelemetryIngestion:
     """Main telemetry ingestion service"""
     
     def __init__(self):
-        self.session_cache = {}
-        self.fingerprint_cache = {}
+        self.session_cache: Dict[str, SessionState] = {}
+        self.fingerprint_cache: Dict[str, Fingerprint] = {}
         self.alert_thresholds = {
             "critical": 10,  # 10 critical attacks trigger alert
             "high": 20,      # 20 high severity attacks trigger alert
             "medium": 50,    # 50 medium severity attacks trigger alert
         }
+        # Attack events are queued and written in batches by _event_writer
+        self.event_queue: Optional[asyncio.Queue] = None
+        self.batch_size = 200
+        self.flush_interval = 1.0  # seconds
+        # Extra attempts for a failed batch write, with a doubling backoff
+        self.write_retries = 2
+        self.retry_backoff = 0.5  # seconds
+        self._writer_task: Optional[asyncio.Task] = None
+        # Attacks per (source_ip, severity, day), counted locally for alerting
+        self.attack_counts: Dict[Tuple[str, str, date], int] = defaultdict(int)
+        # time.monotonic() before which no new alert is raised for a source IP
+        self.alert_cooldown: Dict[str, float] = {}
+        # Cached UTC date, rebuilt only when the epoch day changes
+        self._today_day = -1
+        self._today_date: Optional[date] = None
     
     async def initialize(self):
         """Initialize the telemetry service"""
@@ -37,18 +249,32 @@ class TelemetryIngestion:
         # Load existing fingerprints into cache
         await self._load_fingerprint_cache()
         
+        # Seed today's attack counts for alerting
+        await self._load_attack_counts()
+        
         # Start background tasks
+        self.event_queue = asyncio.Queue(maxsize=10_000)
+        self._writer_task = asyncio.create_task(self._event_writer())
         asyncio.create_task(self._cleanup_old_sessions())
         asyncio.create_task(self._update_attacker_fingerprints())
+        asyncio.create_task(self._prune_attack_counts())
         
         logger.info("✅ Telemetry ingestion service initialized")
     
     async def close(self):
         """Close the telemetry service"""
         logger.info("🛑 Closing telemetry ingestion service...")
+        # Flush queued attack events before shutting down
+        if self._writer_task:
+            await self.event_queue.put(None)
+            await self._writer_task
+            self._writer_task = None
+        
         # Cleanup resources
         self.session_cache.clear()
         self.fingerprint_cache.clear()
+        self.attack_counts.clear()
+        self.alert_cooldown.clear()
     
     async def record_attack_event(
         self,
@@ -74,13 +300,18 @@ class TelemetryIngestion:
         latitude: Optional[float] = None,
         longitude: Optional[float] = None
     ) -> str:
-        """Record an attack event in the database"""
+        """Queue an attack event for the batched database writer"""
         try:
+            # Normalize the address so variants of one IPv6 source share a key
+            source_ip = _normalize_ip(source_ip)
+            
             # Generate unique request ID
-            request_id = f"req_{int(datetime.utcnow().timestamp())}_{uuid.uuid4().hex[:8]}"
+            request_id = f"req_{_ID_PREFIX}{next(_REQ_COUNTER):x}"
             
-            # Create attack event record
+            # Create attack event record; the timestamp is set here because
+            # bulk saves do not refresh column defaults back onto the object
             attack_event = AttackEvent(
+                timestamp=datetime.utcnow(),
                 source_ip=source_ip,
                 user_agent=user_agent,
                 method=method,
@@ -107,34 +338,65 @@ class TelemetryIngestion:
                 tags=self._extract_tags(url, headers, query_params)
             )
             
-            # Save to database
-            db = SessionLocal()
-            try:
-                db.add(attack_event)
-                db.commit()
-                db.refresh(attack_event)
-                
-                logger.info(f"📊 Recorded attack event: {request_id} from {source_ip} ({attack_type}/{severity})")
-                
-                # Update attacker fingerprint
-                await self._update_attacker_fingerprint(attack_event)
-                
-                # Check for alert conditions
-                await self._check_alert_conditions(source_ip, attack_type, severity)
-                
-                return request_id
-                
-            except Exception as e:
-                db.rollback()
-                logger.error(f"❌ Error saving attack event: {e}")
-                raise
-            finally:
-                db.close()
+            await self.event_queue.put(attack_event)
+            
+            # Check for alert conditions
+            await self._check_alert_conditions(source_ip, attack_type, severity)
+            
+            return request_id
                 
         except Exception as e:
             logger.error(f"❌ Error recording attack event: {e}")
             raise
     
+    async def _event_writer(self):
+        """Background task to write queued attack events in batches"""
+        loop = asyncio.get_running_loop()
+        closing = False
+        while not closing:
+            event = await self.event_queue.get()
+            if event is None:
+                break
+            batch = [event]
+            
+            # Collect up to batch_size events or until flush_interval elapses
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self.event_queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is None:
+                    closing = True
+                    break
+                batch.append(event)
+            
+            await self._write_events(batch)
+    
+    async def _write_events(self, batch: List[AttackEvent]):
+        """Save a batch of attack events and run the per-event follow-ups"""
+        for attempt in range(self.write_retries + 1):
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.run_sync(lambda session: session.bulk_save_objects(batch))
+                    await db.commit()
+                logger.info(f"📊 Recorded {len(batch)} attack events")
+                break
+            except Exception as e:
+                if attempt == self.write_retries:
+                    logger.exception(f"❌ Dropped {len(batch)} attack events after {attempt + 1} attempts: {e}")
+                    break
+                logger.warning(f"⚠️ Error saving {len(batch)} attack events, retrying: {e}")
+                await asyncio.sleep(self.retry_backoff * 2 ** attempt)
+        
+        # Update attacker fingerprints even if the events were dropped, since
+        # they are synced to the database separately
+        for attack_event in batch:
+            await self._update_attacker_fingerprint(attack_event)
+    
     async def record_exception(
         self,
         endpoint: str,
@@ -150,18 +412,10 @@ class TelemetryIngestion:
             severity = "medium"
             confidence = 0.5
             
-            if any(pattern in exception.lower() for pattern in ["sql", "injection", "union", "select"]):
-                attack_type = "sql_injection"
-                severity = "high"
-                confidence = 0.8
-            elif any(pattern in exception.lower() for pattern in ["xss", "script", "javascript"]):
-                attack_type = "xss"
-                severity = "medium"
-                confidence = 0.7
-            elif "timeout" in exception.lower() or "connection" in exception.lower():
-                attack_type = "dos"
-                severity = "high"
-                confidence = 0.6
+            # The first listed pattern that matches decides the classification
+            index = _EXCEPTION_GROUP.first(exception)
+            if index is not None:
+                _, attack_type, severity, confidence = _EXCEPTION_PATTERNS[index]
             
             # Record as attack event
             await self.record_attack_event(
@@ -190,48 +444,39 @@ class TelemetryIngestion:
         """Get or create a honeypot session for tracking"""
         session_key = f"{source_ip}:{honeypot_type}"
         
-        if session_key not in self.session_cache:
-            session_id = f"session_{uuid.uuid4().hex[:12]}"
-            self.session_cache[session_key] = {
-                "session_id": session_id,
-                "source_ip": source_ip,
-                "honeypot_type": honeypot_type,
-                "start_time": datetime.utcnow(),
-                "request_count": 0,
-                "endpoints": set()
-            }
+        # One lookup for known sessions; no await here, so nothing can race
+        session = self.session_cache.get(session_key)
+        if session is None:
+            session_id = f"session_{_ID_PREFIX}{next(_SESS_COUNTER):x}"
+            session = self.session_cache[session_key] = SessionState(
+                session_id=session_id,
+                source_ip=source_ip,
+                honeypot_type=honeypot_type,
+                start_time=datetime.utcnow()
+            )
         
-        session = self.session_cache[session_key]
-        session["request_count"] += 1
-        session["endpoints"].add(endpoint)
-        session["last_activity"] = datetime.utcnow()
+        session.request_count += 1
+        session.endpoints.add(endpoint)
+        session.last_activity = time.monotonic()
         
-        return session["session_id"]
+        return session.session_id
     
     def _extract_tags(self, url: str, headers: Dict[str, str], query_params: Dict[str, str]) -> List[str]:
         """Extract relevant tags from request data"""
         tags = []
         
         # Check for common attack patterns
-        if any(pattern in url.lower() for pattern in ["admin", "login", "auth"]):
-            tags.append("authentication_related")
-        
-        if any(pattern in url.lower() for pattern in ["api", "rest", "json"]):
-            tags.append("api_endpoint")
-        
-        if any(pattern in url.lower() for pattern in ["sql", "database", "query"]):
-            tags.append("database_related")
-        
-        if any(pattern in url.lower() for pattern in ["file", "upload", "download"]):
-            tags.append("file_operation")
+        hits = _URL_TAG_GROUP.matches(url)
+        for i, (_, tag) in enumerate(_URL_TAGS):
+            if i in hits:
+                tags.append(tag)
         
         # Check headers
         if "x-forwarded-for" in headers:
             tags.append("proxied_request")
         
         if "user-agent" in headers:
-            ua = headers["user-agent"].lower()
-            if any(tool in ua for tool in ["sqlmap", "nikto", "nmap", "burp", "zap"]):
+            if _TOOL_GROUP.matches(headers["user-agent"]):
                 tags.append("automated_tool")
         
         return tags
@@ -241,98 +486,104 @@ class TelemetryIngestion:
         try:
             source_ip = attack_event.source_ip
             
-            # Get or create fingerprint
-            if source_ip not in self.fingerprint_cache:
-                await self._load_attacker_fingerprint(source_ip)
-            
-            fingerprint = self.fingerprint_cache.get(source_ip, {})
+            # Get or create fingerprint; new sources start locally and are
+            # merged with any database record by the periodic sync
+            fingerprint = self.fingerprint_cache.get(source_ip)
+            if fingerprint is None:
+                fingerprint = self.fingerprint_cache[source_ip] = Fingerprint()
             
             # Update fingerprint data
-            if "attack_patterns" not in fingerprint:
-                fingerprint["attack_patterns"] = {}
-            
-            attack_type = attack_event.attack_type or "normal"
-            fingerprint["attack_patterns"][attack_type] = fingerprint["attack_patterns"].get(attack_type, 0) + 1
-            
-            # Update user agents
-            if "user_agents" not in fingerprint:
-                fingerprint["user_agents"] = set()
-            fingerprint["user_agents"].add(attack_event.user_agent or "Unknown")
-            
-            # Update endpoints
-            if "endpoints" not in fingerprint:
-                fingerprint["endpoints"] = set()
-            fingerprint["endpoints"].add(attack_event.endpoint)
+            fingerprint.attack_patterns[attack_event.attack_type or "normal"] += 1
+            fingerprint.user_agents.add(attack_event.user_agent or "Unknown")
+            fingerprint.endpoints.add(attack_event.endpoint)
             
             # Update timing patterns
-            if "timing_patterns" not in fingerprint:
-                fingerprint["timing_patterns"] = []
-            fingerprint["timing_patterns"].append({
-                "timestamp": attack_event.timestamp,
-                "response_time": attack_event.response_time
-            })
+            if len(fingerprint.timestamps) >= _FINGERPRINT_MAX_TIMINGS:
+                del fingerprint.timestamps[0]
+                del fingerprint.response_times[0]
+            fingerprint.timestamps.append((attack_event.timestamp - _EPOCH).total_seconds())
+            fingerprint.response_times.append(attack_event.response_time or 0.0)
             
             # Update statistics
-            fingerprint["total_requests"] = fingerprint.get("total_requests", 0) + 1
-            fingerprint["unique_endpoints"] = len(fingerprint.get("endpoints", set()))
-            fingerprint["last_seen"] = attack_event.timestamp
-            fingerprint["first_seen"] = fingerprint.get("first_seen", attack_event.timestamp)
-            
-            # Calculate risk score
-            fingerprint["risk_score"] = self._calculate_risk_score(fingerprint)
+            fingerprint.total_requests += 1
+            fingerprint.unique_endpoints = len(fingerprint.endpoints)
+            fingerprint.last_seen = attack_event.timestamp
+            if fingerprint.first_seen is None:
+                fingerprint.first_seen = attack_event.timestamp
             
-            # Cache updated fingerprint
-            self.fingerprint_cache[source_ip] = fingerprint
             
         except Exception as e:
             logger.error(f"❌ Error updating attacker fingerprint: {e}")
     
-    def _calculate_risk_score(self, fingerprint: Dict[str, Any]) -> float:
-        """Calculate risk score for attacker"""
-        score = 0.0
+    def _calculate_risk_scores(self, fingerprints: List[Fingerprint]) -> np.ndarray:
+        """Calculate risk scores for a batch of attackers"""
+        count = len(fingerprints)
+        total_requests = np.fromiter((fp.total_requests for fp in fingerprints), dtype=np.float64, count=count)
+        unique_endpoints = np.fromiter((fp.unique_endpoints for fp in fingerprints), dtype=np.float64, count=count)
+        attack_types = np.fromiter((len(fp.attack_patterns) for fp in fingerprints), dtype=np.float64, count=count)
+        user_agents = np.fromiter((len(fp.user_agents) for fp in fingerprints), dtype=np.int64, count=count)
         
         # Base score from request count
-        score += min(fingerprint.get("total_requests", 0) * 2, 50)
+        score = np.minimum(total_requests * 2, 50)
         
         # Endpoint diversity
-        score += min(fingerprint.get("unique_endpoints", 0) * 3, 30)
+        score += np.minimum(unique_endpoints * 3, 30)
         
         # Attack type diversity
-        attack_types = len(fingerprint.get("attack_patterns", {}))
-        score += min(attack_types * 5, 20)
+        score += np.minimum(attack_types * 5, 20)
         
         # User agent diversity (potential bot detection)
-        user_agents = len(fingerprint.get("user_agents", set()))
-        if user_agents > 3:
-            score += 10  # Multiple user agents suggest automation
+        score += np.where(user_agents > 3, 10, 0)  # Multiple user agents suggest automation
         
-        return min(score, 100.0)
+        return np.minimum(score, 100.0)
+    
+    def _today(self) -> date:
+        """Current UTC date without building a datetime on every call"""
+        day = int(time.time() // 86400)
+        if day != self._today_day:
+            self._today_day = day
+            self._today_date = _EPOCH.date() + timedelta(days=day)
+        return self._today_date
     
     async def _check_alert_conditions(self, source_ip: str, attack_type: str, severity: str):
         """Check if alert conditions are met"""
         try:
-            # Get recent attack count for this IP
-            db = SessionLocal()
-            try:
-                recent_attacks = db.query(AttackEvent).filter(
-                    and_(
-                        AttackEvent.source_ip == source_ip,
-                        AttackEvent.timestamp >= datetime.utcnow().replace(hour=0, minute=0, second=0),
-                        AttackEvent.severity == severity
-                    )
-                ).count()
-                
-                # Check threshold
-                threshold = self.alert_thresholds.get(severity, 100)
-                if recent_attacks >= threshold:
-                    await self._create_security_alert(source_ip, severity, recent_attacks, attack_type)
-                    
-            finally:
-                db.close()
+            # Count today's attacks for this IP locally instead of querying
+            key = (source_ip, severity, self._today())
+            self.attack_counts[key] += 1
+            recent_attacks = self.attack_counts[key]
+            
+            # Check threshold, alerting at most once per cooldown for an IP
+            threshold = self.alert_thresholds.get(severity, 100)
+            if recent_attacks >= threshold:
+                now = time.monotonic()
+                if now < self.alert_cooldown.get(source_ip, 0.0):
+                    return
+                self.alert_cooldown[source_ip] = now + _ALERT_COOLDOWN
+                await self._create_security_alert(source_ip, severity, recent_attacks, attack_type)
                 
         except Exception as e:
             logger.error(f"❌ Error checking alert conditions: {e}")
     
+    async def _load_attack_counts(self):
+        """Seed today's per-IP attack counts from the database"""
+        try:
+            today = self._today()
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(AttackEvent.source_ip, AttackEvent.severity, func.count()).where(
+                        AttackEvent.timestamp >= datetime.combine(today, datetime.min.time())
+                    ).group_by(AttackEvent.source_ip, AttackEvent.severity)
+                )).all()
+            
+            for source_ip, severity, count in rows:
+                self.attack_counts[(source_ip, severity, today)] = count
+            
+            logger.info(f"📚 Loaded {len(rows)} attack counts")
+            
+        except Exception as e:
+            logger.error(f"❌ Error loading attack counts: {e}")
+    
     async def _create_security_alert(
         self, 
         source_ip: str, 
@@ -342,7 +593,7 @@ class TelemetryIngestion:
     ):
         """Create a security alert"""
         try:
-            alert_id = f"alert_{uuid.uuid4().hex[:12]}"
+            alert_id = f"alert_{_ID_PREFIX}{next(_ALERT_COUNTER):x}"
             
             alert = SecurityAlert(
                 alert_id=alert_id,
@@ -356,13 +607,10 @@ class TelemetryIngestion:
                 status="open"
             )
             
-            db = SessionLocal()
-            try:
+            async with AsyncSessionLocal() as db:
                 db.add(alert)
-                db.commit()
-                logger.info(f"🚨 Created security alert: {alert_id} for {source_ip}")
-            finally:
-                db.close()
+                await db.commit()
+            logger.info(f"🚨 Created security alert: {alert_id} for {source_ip}")
                 
         except Exception as e:
             logger.error(f"❌ Error creating security alert: {e}")
@@ -370,84 +618,33 @@ class TelemetryIngestion:
     async def _load_fingerprint_cache(self):
         """Load existing fingerprints into cache"""
         try:
-            db = SessionLocal()
-            try:
+            async with AsyncSessionLocal() as db:
                 # Get recent fingerprints
-                fingerprints = db.query(AttackerFingerprint).filter(
-                    AttackerFingerprint.last_seen >= datetime.utcnow().replace(day=1)  # This month
-                ).all()
-                
-                for fp in fingerprints:
-                    self.fingerprint_cache[fp.source_ip] = {
-                        "attack_patterns": fp.attack_patterns or {},
-                        "user_agents": set(fp.user_agents or []),
-                        "endpoints": set(fp.common_endpoints or []),
-                        "total_requests": fp.total_requests or 0,
-                        "unique_endpoints": fp.unique_endpoints or 0,
-                        "risk_score": fp.risk_score or 0.0,
-                        "first_seen": fp.first_seen,
-                        "last_seen": fp.last_seen
-                    }
-                
-                logger.info(f"📚 Loaded {len(fingerprints)} fingerprints into cache")
-                
-            finally:
-                db.close()
+                fingerprints = (await db.scalars(
+                    select(AttackerFingerprint).where(
+                        AttackerFingerprint.last_seen >= datetime.utcnow().replace(day=1)  # This month
+                    )
+                )).all()
+            
+            for fp in fingerprints:
+                self.fingerprint_cache[fp.source_ip] = Fingerprint.from_record(fp)
+            
+            logger.info(f"📚 Loaded {len(fingerprints)} fingerprints into cache")
                 
         except Exception as e:
             logger.error(f"❌ Error loading fingerprint cache: {e}")
     
-    async def _load_attacker_fingerprint(self, source_ip: str):
-        """Load specific attacker fingerprint"""
-        try:
-            db = SessionLocal()
-            try:
-                fingerprint = db.query(AttackerFingerprint).filter(
-                    AttackerFingerprint.source_ip == source_ip
-                ).first()
-                
-                if fingerprint:
-                    self.fingerprint_cache[source_ip] = {
-                        "attack_patterns": fingerprint.attack_patterns or {},
-                        "user_agents": set(fingerprint.user_agents or []),
-                        "endpoints": set(fingerprint.common_endpoints or []),
-                        "total_requests": fingerprint.total_requests or 0,
-                        "unique_endpoints": fingerprint.unique_endpoints or 0,
-                        "risk_score": fingerprint.risk_score or 0.0,
-                        "first_seen": fingerprint.first_seen,
-                        "last_seen": fingerprint.last_seen
-                    }
-                else:
-                    # Create new fingerprint entry
-                    self.fingerprint_cache[source_ip] = {
-                        "attack_patterns": {},
-                        "user_agents": set(),
-                        "endpoints": set(),
-                        "total_requests": 0,
-                        "unique_endpoints": 0,
-                        "risk_score": 0.0,
-                        "first_seen": datetime.utcnow(),
-                        "last_seen": datetime.utcnow()
-                    }
-                    
-            finally:
-                db.close()
-                
-        except Exception as e:
-            logger.error(f"❌ Error loading attacker fingerprint: {e}")
-    
     async def _cleanup_old_sessions(self):
         """Background task to cleanup old sessions"""
         while True:
             try:
                 await asyncio.sleep(3600)  # Run every hour
                 
-                current_time = datetime.utcnow()
-                expired_sessions = []
-                
-                for key, session in self.session_cache.items():
-                    if (current_time - session["last_activity"]).total_seconds() > 3600:  # 1 hour timeout
-                        expired_sessions.append(key)
+                now = time.monotonic()
+                expired_sessions = [
+                    key for key, session in self.session_cache.items()
+                    if now - session.last_activity > 3600  # 1 hour timeout
+                ]
                 
                 for key in expired_sessions:
                     del self.session_cache[key]
@@ -458,6 +655,45 @@ class TelemetryIngestion:
             except Exception as e:
                 logger.error(f"❌ Error in session cleanup: {e}")
     
+    async def _prune_attack_counts(self):
+        """Background task to drop old attack counts and expired alert cooldowns"""
+        while True:
+            try:
+                await asyncio.sleep(3600)  # Run every hour
+                
+                cutoff = self._today() - timedelta(days=1)
+                expired_keys = [key for key in self.attack_counts if key[2] < cutoff]
+                
+                for key in expired_keys:
+                    del self.attack_counts[key]
+                
+                if expired_keys:
+                    logger.info(f"🧹 Pruned {len(expired_keys)} old attack counts")
+                
+                now = time.monotonic()
+                for source_ip in [ip for ip, until in self.alert_cooldown.items() if until <= now]:
+                    del self.alert_cooldown[source_ip]
+                    
+            except Exception as e:
+                logger.error(f"❌ Error pruning attack counts: {e}")
+    
+    def _fingerprint_row(self, source_ip: str, fingerprint: Fingerprint) -> Dict[str, Any]:
+        """Build the AttackerFingerprint column values for a cached fingerprint"""
+        return {
+            "source_ip": source_ip,
+            "attack_patterns": dict(fingerprint.attack_patterns),
+            "user_agents": list(fingerprint.user_agents),
+            "common_endpoints": list(fingerprint.endpoints),
+            "total_requests": fingerprint.total_requests,
+            "unique_endpoints": fingerprint.unique_endpoints,
+            "risk_score": fingerprint.risk_score,
+            "first_seen": fingerprint.first_seen,
+            "last_seen": fingerprint.last_seen,
+            "threat_level": _THREAT_LABELS[bisect.bisect_left(_THREAT_BOUNDS, fingerprint.risk_score)],
+            # Detect potential bots
+            "is_bot": len(fingerprint.user_agents) > 3
+        }
+    
     async def _update_attacker_fingerprints(self):
         """Background task to update attacker fingerprints in database"""
         while True:
@@ -467,46 +703,49 @@ class TelemetryIngestion:
                 if not self.fingerprint_cache:
                     continue
                 
-                db = SessionLocal()
-                try:
-                    for source_ip, fingerprint_data in self.fingerprint_cache.items():
-                        # Get or create fingerprint record
-                        fingerprint = db.query(AttackerFingerprint).filter(
-                            AttackerFingerprint.source_ip == source_ip
-                        ).first()
+                # Snapshot the cache, the batch writer keeps updating it meanwhile
+                fingerprints = list(self.fingerprint_cache.items())
+                
+                async with AsyncSessionLocal() as db:
+                    for start in range(0, len(fingerprints), _FINGERPRINT_SYNC_CHUNK):
+                        chunk = fingerprints[start:start + _FINGERPRINT_SYNC_CHUNK]
                         
-                        if not fingerprint:
-                            fingerprint = AttackerFingerprint(source_ip=source_ip)
-                            db.add(fingerprint)
+                        # Look up existing records for the whole chunk at once
+                        records = (await db.scalars(
+                            select(AttackerFingerprint).where(
+                                AttackerFingerprint.source_ip.in_([source_ip for source_ip, _ in chunk])
+                            )
+                        )).all()
+                        existing = {}
+                        for record in records:
+                            existing[record.source_ip] = record.id
+                            fingerprint = self.fingerprint_cache.get(record.source_ip)
+                            if fingerprint is not None and not fingerprint.reconciled:
+                                fingerprint.merge_record(record)
                         
-                        # Update fingerprint data
-                        fingerprint.attack_patterns = fingerprint_data["attack_patterns"]
-                        fingerprint.user_agents = list(fingerprint_data["user_agents"])
-                        fingerprint.common_endpoints = list(fingerprint_data["endpoints"])
-                        fingerprint.total_requests = fingerprint_data["total_requests"]
-                        fingerprint.unique_endpoints = fingerprint_data["unique_endpoints"]
-                        fingerprint.risk_score = fingerprint_data["risk_score"]
-                        fingerprint.first_seen = fingerprint_data["first_seen"]
-                        fingerprint.last_seen = fingerprint_data["last_seen"]
+                        # Score the whole chunk in one vectorized pass
+                        scores = self._calculate_risk_scores([fingerprint for _, fingerprint in chunk])
                         
-                        # Calculate threat level
-                        if fingerprint_data["risk_score"] > 80:
-                            fingerprint.threat_level = "critical"
-                        elif fingerprint_data["risk_score"] > 60:
-                            fingerprint.threat_level = "high"
-                        elif fingerprint_data["risk_score"] > 40:
-                            fingerprint.threat_level = "medium"
-                        else:
-                            fingerprint.threat_level = "low"
+                        inserts = []
+                        updates = []
+                        for (source_ip, fingerprint), risk_score in zip(chunk, scores.tolist()):
+                            fingerprint.risk_score = risk_score
+                            row = self._fingerprint_row(source_ip, fingerprint)
+                            if source_ip in existing:
+                                row["id"] = existing[source_ip]
+                                updates.append(row)
+                            else:
+                                inserts.append(row)
+                            fingerprint.reconciled = True
                         
-                        # Detect potential bots
-                        fingerprint.is_bot = len(fingerprint_data["user_agents"]) > 3
-                    
-                    db.commit()
-                    logger.info(f"💾 Updated {len(self.fingerprint_cache)} attacker fingerprints")
-                    
-                finally:
-                    db.close()
-                    
+                        def write_chunk(session):
+                            session.bulk_insert_mappings(AttackerFingerprint, inserts)
+                            session.bulk_update_mappings(AttackerFingerprint, updates)
+                        
+                        await db.run_sync(write_chunk)
+                        await db.commit()
+                
+                logger.info(f"💾 Updated {len(fingerprints)} attacker fingerprints")
+                
             except Exception as e:
                 logger.error(f"❌ Error updating attacker fingerprints: {e}")
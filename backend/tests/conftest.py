@@ -0,0 +1,9 @@
+"""
+Shared pytest setup for the backend tests
+"""
+
+import sys
+from pathlib import Path
+
+# Import backend modules the way the app does when run from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
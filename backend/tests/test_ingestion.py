@@ -0,0 +1,57 @@
+"""
+Tests for batched attack-event writes in the telemetry ingestion service
+"""
+
+import logging
+from datetime import datetime
+
+import pytest
+
+import telemetry.ingestion as ingestion
+from database.models import AttackEvent
+
+class FailingSession:
+    """Async session stand-in whose commit always fails"""
+    
+    attempts = 0
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+    
+    async def run_sync(self, fn):
+        pass
+    
+    async def commit(self):
+        FailingSession.attempts += 1
+        raise RuntimeError("database unavailable")
+
+def _event(source_ip: str) -> AttackEvent:
+    return AttackEvent(
+        timestamp=datetime.utcnow(),
+        source_ip=source_ip,
+        user_agent="sqlmap/1.5.2",
+        method="GET",
+        endpoint="/api/users",
+        attack_type="sql_injection",
+        response_time=0.1
+    )
+
+@pytest.mark.asyncio
+async def test_failed_commit_retries_then_keeps_fingerprints(monkeypatch, caplog):
+    FailingSession.attempts = 0
+    monkeypatch.setattr(ingestion, "AsyncSessionLocal", FailingSession)
+    telemetry = ingestion.TelemetryIngestion()
+    telemetry.retry_backoff = 0
+    batch = [_event("203.0.113.7"), _event("203.0.113.7"), _event("198.51.100.9")]
+    
+    with caplog.at_level(logging.ERROR, logger=ingestion.logger.name):
+        await telemetry._write_events(batch)
+    
+    assert FailingSession.attempts == telemetry.write_retries + 1
+    assert "Dropped 3 attack events" in caplog.text
+    assert caplog.records[-1].exc_info is not None
+    assert telemetry.fingerprint_cache["203.0.113.7"].total_requests == 2
+    assert telemetry.fingerprint_cache["198.51.100.9"].total_requests == 1
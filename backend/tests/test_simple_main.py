@@ -0,0 +1,25 @@
+"""
+Tests for the simple honeypot server's rendered pages
+"""
+
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import simple_main
+
+DATA = Path(__file__).parent / "data"
+
+def test_analytics_page_matches_pre_encoded_chrome_baseline():
+    # Captured from the page before its chrome was pre-encoded, with the
+    # footer script's braces un-doubled
+    expected = (DATA / "analytics_page_empty.html").read_bytes()
+    
+    with TestClient(simple_main.app) as client:
+        plain = client.get("/analytics-page", headers={"accept-encoding": "identity"})
+        compressed = client.get("/analytics-page", headers={"accept-encoding": "gzip"})
+    
+    assert plain.content == expected
+    assert b"setTimeout(() => {\n" in plain.content
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.content == expected
@@ -6,6 +6,13 @@ Test script to verify the honeypot server is working
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+def _generate_then_analytics(session, base_url):
+    """Generate test attacks, then read the analytics that include them"""
+    generated = session.get(f"{base_url}/generate-attacks?count=5", timeout=10)
+    analytics = session.get(f"{base_url}/analytics", timeout=5)
+    return generated, analytics
 
 def test_server():
     base_url = "http://localhost:8000"
@@ -13,20 +20,30 @@ def test_server():
     print("🛡️ Testing AI Cybersecurity Honeypot Server...")
     print("=" * 50)
     
+    # One keep-alive session shared by every check
+    session = requests.Session()
+    
     try:
         # Test 1: Health check
         print("1. Testing health endpoint...")
-        response = requests.get(f"{base_url}/health", timeout=5)
+        response = session.get(f"{base_url}/health", timeout=5)
         if response.status_code == 200:
             print("✅ Health check passed!")
             print(f"   Response: {response.json()}")
         else:
             print(f"❌ Health check failed: {response.status_code}")
             return False
+        
+        # The remaining checks are independent, so run them concurrently;
+        # analytics stays after attack generation since it reports on it
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            root_future = executor.submit(session.get, f"{base_url}/", timeout=5)
+            login_future = executor.submit(session.get, f"{base_url}/honeypots/login", timeout=5)
+            attacks_future = executor.submit(_generate_then_analytics, session, base_url)
             
         # Test 2: Root endpoint
         print("\n2. Testing root endpoint...")
-        response = requests.get(f"{base_url}/", timeout=5)
+        response = root_future.result()
         if response.status_code == 200:
             print("✅ Root endpoint working!")
             data = response.json()
@@ -37,7 +54,7 @@ def test_server():
             
         # Test 3: Login page
         print("\n3. Testing honeypot login page...")
-        response = requests.get(f"{base_url}/honeypots/login", timeout=5)
+        response = login_future.result()
         if response.status_code == 200:
             print("✅ Login honeypot working!")
             print("   📝 You can visit: http://localhost:8000/honeypots/login")
@@ -46,7 +63,7 @@ def test_server():
             
         # Test 4: Generate test attacks
         print("\n4. Generating test attacks...")
-        response = requests.get(f"{base_url}/generate-attacks?count=5", timeout=10)
+        response, analytics_response = attacks_future.result()
         if response.status_code == 200:
             print("✅ Test attacks generated!")
             data = response.json()
@@ -56,7 +73,7 @@ def test_server():
             
         # Test 5: Check analytics
         print("\n5. Testing analytics...")
-        response = requests.get(f"{base_url}/analytics", timeout=5)
+        response = analytics_response
         if response.status_code == 200:
             print("✅ Analytics working!")
             data = response.json()
@@ -88,6 +105,8 @@ def test_server():
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
+    finally:
+        session.close()
 
 if __name__ == "__main__":
     test_server()
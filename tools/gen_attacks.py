@@ -6,12 +6,15 @@ Generates realistic attack patterns for educational and testing purposes
 
 import asyncio
 import aiohttp
-import random
+import numpy as np
 import argparse
-import json
+import gc
+import orjson
 import time
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from collections import Counter
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from urllib.parse import urlencode
 import logging
 
 # Configure logging
@@ -29,251 +32,308 @@ SYNTHETIC_IPS = [
 
 # Geographic data for synthetic attacks
 COUNTRIES = [
-    {"name": "United States", "flag": "🇺🇸", "ips": ["192.168.1.100", "192.168.1.101"]},
-    {"name": "China", "flag": "🇨🇳", "ips": ["10.0.0.45", "10.0.0.46"]},
-    {"name": "Russia", "flag": "🇷🇺", "ips": ["172.16.0.78", "172.16.0.79"]},
-    {"name": "Germany", "flag": "🇩🇪", "ips": ["203.0.113.12", "203.0.113.13"]},
-    {"name": "United Kingdom", "flag": "🇬🇧", "ips": ["198.51.100.34", "198.51.100.35"]},
-    {"name": "Japan", "flag": "🇯🇵", "ips": ["203.0.113.14"]},
-    {"name": "Brazil", "flag": "🇧🇷", "ips": ["172.16.0.80"]},
-    {"name": "India", "flag": "🇮🇳", "ips": ["10.0.0.47"]},
+    {"name": "United States", "flag": "🇺🇸", "ips": ("192.168.1.100", "192.168.1.101")},
+    {"name": "China", "flag": "🇨🇳", "ips": ("10.0.0.45", "10.0.0.46")},
+    {"name": "Russia", "flag": "🇷🇺", "ips": ("172.16.0.78", "172.16.0.79")},
+    {"name": "Germany", "flag": "🇩🇪", "ips": ("203.0.113.12", "203.0.113.13")},
+    {"name": "United Kingdom", "flag": "🇬🇧", "ips": ("198.51.100.34", "198.51.100.35")},
+    {"name": "Japan", "flag": "🇯🇵", "ips": ("203.0.113.14",)},
+    {"name": "Brazil", "flag": "🇧🇷", "ips": ("172.16.0.80",)},
+    {"name": "India", "flag": "🇮🇳", "ips": ("10.0.0.47",)},
 ]
 
 # User agents for different attack types
 USER_AGENTS = {
-    "normal": [
+    "normal": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    ],
-    "sqlmap": [
+    ),
+    "sqlmap": (
         "sqlmap/1.0-dev (http://sqlmap.org)",
         "sqlmap/1.4.7 (http://sqlmap.org)",
         "sqlmap/1.5.2 (http://sqlmap.org)"
-    ],
-    "nikto": [
+    ),
+    "nikto": (
         "Mozilla/5.0 (compatible; Nikto/2.1.6)",
         "Mozilla/5.0 (compatible; Nikto/2.1.7)",
         "Mozilla/5.0 (compatible; Nikto/2.1.8)"
-    ],
-    "nmap": [
+    ),
+    "nmap": (
         "Mozilla/5.0 (compatible; Nmap Scripting Engine)",
         "Nmap Scripting Engine"
-    ],
-    "burp": [
+    ),
+    "burp": (
         "Mozilla/5.0 (compatible; Burp Suite)",
         "Burp Suite Professional"
-    ]
+    )
 }
 
-# Attack patterns
+# Combined user-agent pools, built once rather than per generator call
+UA_SQL = USER_AGENTS["sqlmap"] + USER_AGENTS["normal"]
+UA_TRAVERSAL = USER_AGENTS["nikto"] + USER_AGENTS["nmap"]
+UA_AUTOMATED = USER_AGENTS["nikto"] + USER_AGENTS["nmap"] + USER_AGENTS["burp"]
+
+# Attack patterns (tuples, shared read-only by every generated record)
 ATTACK_PATTERNS = {
-    "sql_injection": [
+    "sql_injection": (
         "/api/users?id=1 UNION SELECT * FROM users WHERE 1=1--",
         "/api/products?id=1' OR '1'='1",
         "/api/search?q=1'; DROP TABLE users; --",
         "/api/login?user=admin'--&pass=anything",
         "/api/data?id=1 AND (SELECT COUNT(*) FROM information_schema.tables)>0--",
-    ],
-    "xss": [
+    ),
+    "xss": (
         "/api/search?q=<script>alert('xss')</script>",
         "/api/comment?text=<img src=x onerror=alert('xss')>",
         "/api/feedback?message=javascript:alert('xss')",
         "/api/profile?name=<svg onload=alert('xss')>",
         "/api/post?content=<iframe src=javascript:alert('xss')></iframe>",
-    ],
-    "directory_traversal": [
+    ),
+    "directory_traversal": (
         "/api/files/../../../etc/passwd",
         "/api/download/..\\..\\..\\windows\\system32\\drivers\\etc\\hosts",
         "/api/docs/....//....//....//etc/passwd",
         "/api/backup/../../../var/log/apache2/access.log",
         "/api/config/..%2F..%2F..%2Fetc%2Fshadow",
-    ],
-    "brute_force": [
+    ),
+    "brute_force": (
         "/api/honeypots/login",
         "/api/auth/login",
         "/api/admin/login",
         "/api/user/login",
-    ],
-    "information_disclosure": [
+    ),
+    "information_disclosure": (
         "/api/config",
         "/api/admin/config",
         "/api/system/info",
         "/api/debug/info",
         "/api/version",
         "/api/status",
-    ],
-    "automated_tool": [
+    ),
+    "automated_tool": (
         "/api/admin",
         "/api/admin/users",
         "/api/admin/config",
         "/api/test",
         "/api/health",
         "/api/metrics",
-    ]
+    )
 }
 
+def build_alias_table(weights: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+    """Build Walker alias tables (prob, alias) for O(1) weighted sampling"""
+    n = len(weights)
+    scaled = np.asarray(weights, dtype=np.float64) * n / np.sum(weights)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1.0]
+    large = [i for i in range(n) if scaled[i] >= 1.0]
+    
+    while small and large:
+        under, over = small.pop(), large.pop()
+        prob[under] = scaled[under]
+        alias[under] = over
+        scaled[over] -= 1.0 - scaled[under]
+        (small if scaled[over] < 1.0 else large).append(over)
+    
+    return prob, alias
+
+# Reverse lookup of (country name, flag) by synthetic IP
+IP_TO_COUNTRY = {ip: (country["name"], country["flag"]) for country in COUNTRIES for ip in country["ips"]}
+ALL_IPS = tuple(IP_TO_COUNTRY)
+
+# Flattened (country, IP) pairs, weighted so every country is equally likely
+# as with picking a country and then one of its IPs
+_COUNTRY_IP_COUNTS = {country["name"]: len(country["ips"]) for country in COUNTRIES}
+_PAIR_IPS = ALL_IPS
+_PAIR_COUNTRIES = tuple(IP_TO_COUNTRY[ip][0] for ip in ALL_IPS)
+_N_PAIRS = len(_PAIR_IPS)
+_PAIR_PROB, _PAIR_ALIAS = build_alias_table(
+    [1.0 / _COUNTRY_IP_COUNTS[IP_TO_COUNTRY[ip][0]] for ip in ALL_IPS]
+)
+
+# Records serialized per orjson call when writing --output
+OUTPUT_CHUNK_SIZE = 10_000
+
+def write_attacks(path: str, attacks: List[Dict[str, Any]], pretty: bool = False):
+    """Write attacks as a JSON array, serializing in chunks to keep peak memory flat"""
+    options = orjson.OPT_SERIALIZE_NUMPY
+    with open(path, "wb") as f:
+        if pretty:
+            f.write(orjson.dumps(attacks, option=options | orjson.OPT_INDENT_2))
+            return
+        
+        f.write(b"[")
+        for start in range(0, len(attacks), OUTPUT_CHUNK_SIZE):
+            if start:
+                f.write(b",")
+            # Strip each chunk's brackets so the chunks join into one array
+            f.write(orjson.dumps(attacks[start:start + OUTPUT_CHUNK_SIZE], option=options)[1:-1])
+        f.write(b"]")
+
+async def stream_attacks(path: str, generate, count: int, chunk_size: int = OUTPUT_CHUNK_SIZE) -> int:
+    """Generate and write attacks as NDJSON one chunk at a time, so memory stays
+    bounded by the chunk size; records are timestamp-ordered within each chunk"""
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+    written = 0
+    with open(path, "wb") as f:
+        for start in range(0, count, chunk_size):
+            attacks = await generate(min(chunk_size, count - start))
+            f.write(b"".join(orjson.dumps(attack, option=options) for attack in attacks))
+            written += len(attacks)
+    return written
+
 class SyntheticAttackGenerator:
     """Generate synthetic attack patterns for testing"""
     
-    def __init__(self, base_url: str = "http://localhost:8000"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8000",
+        concurrency: int = 32,
+        max_connections: int = 1000,
+        seed: Optional[int] = None
+    ):
         self.base_url = base_url
         self.session = None
+        # PCG64 generator owned by this instance; seed it for reproducible runs
+        self.rng = np.random.default_rng(seed)
+        self.concurrency = concurrency
+        self.max_connections = max_connections
+        
+        # Honeypot routes per attack type as (url, method, form body, query param
+        # carrying the attack endpoint); other types are sent to their own endpoint.
+        # The login form is urlencoded once since the honeypot parses it as a form
+        login_form = urlencode({"username": "admin", "password": "password"}).encode()
+        self._handlers = {
+            "brute_force": (f"{base_url}/api/honeypots/login", "POST", login_form, None),
+            "sql_injection": (f"{base_url}/api/honeypots/sql", "GET", None, "query"),
+            "directory_traversal": (f"{base_url}/api/honeypots/file", "GET", None, "path"),
+        }
+        # Full passthrough URLs by endpoint; endpoints come from fixed pools
+        self._urls: Dict[str, str] = {}
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Explicit connector limits and keep-alive instead of aiohttp's 100-socket default
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections,
+            keepalive_timeout=30,
+            ttl_dns_cache=300
+        )
+        timeout = aiohttp.ClientTimeout(total=10)
+        self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
     
-    async def generate_normal_traffic(self, count: int = 50) -> List[Dict[str, Any]]:
-        """Generate normal web traffic"""
-        attacks = []
+    def _pick(self, pool: Sequence[str], count: int) -> List[str]:
+        """Draw count items from pool by index, so records share the pool's
+        string objects instead of fresh copies from a NumPy string array"""
+        return [pool[i] for i in self.rng.integers(0, len(pool), count).tolist()]
+    
+    def _generate_batch(
+        self,
+        count: int,
+        attack_type: str,
+        user_agents: Sequence[str],
+        methods: Sequence[str],
+        endpoints: Sequence[str],
+        severities: Sequence[str],
+        confidence: Tuple[float, float],
+        anomaly_score: Tuple[float, float]
+    ) -> List[Dict[str, Any]]:
+        """Generate attack records, sampling each field for the whole batch at once"""
+        rng = self.rng
         
-        for i in range(count):
-            country = random.choice(COUNTRIES)
-            ip = random.choice(country["ips"])
-            
-            attack = {
-                "timestamp": datetime.utcnow() - timedelta(minutes=random.randint(1, 1440)),
-                "source_ip": ip,
-                "country": country["name"],
-                "user_agent": random.choice(USER_AGENTS["normal"]),
-                "method": random.choice(["GET", "POST"]),
-                "endpoint": random.choice([
-                    "/api/users", "/api/products", "/api/search", 
-                    "/api/about", "/api/contact", "/api/help"
-                ]),
-                "attack_type": "normal",
-                "severity": "low",
-                "confidence": random.uniform(0.1, 0.3),
-                "anomaly_score": random.uniform(0.1, 0.4),
-            }
-            attacks.append(attack)
+        # Pick (country, IP) pairs with one alias-table draw each
+        k = rng.integers(0, _N_PAIRS, count)
+        pair_idx = np.where(rng.random(count) < _PAIR_PROB[k], k, _PAIR_ALIAS[k]).tolist()
         
-        return attacks
+        # Spread timestamps over the last day
+        minutes = rng.integers(1, 1441, count)
+        timestamps = np.datetime64(datetime.utcnow(), "us") - minutes.astype("timedelta64[m]")
+        
+        columns = zip(
+            timestamps.tolist(),
+            [_PAIR_IPS[i] for i in pair_idx],
+            [_PAIR_COUNTRIES[i] for i in pair_idx],
+            self._pick(user_agents, count),
+            self._pick(methods, count),
+            self._pick(endpoints, count),
+            self._pick(severities, count),
+            rng.uniform(*confidence, count).tolist(),
+            rng.uniform(*anomaly_score, count).tolist()
+        )
+        
+        # The records hold no reference cycles; pausing the cyclic GC stops it
+        # rescanning the growing batch every few hundred allocations
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return [
+                {
+                    "timestamp": timestamp,
+                    "source_ip": ip,
+                    "country": country,
+                    "user_agent": user_agent,
+                    "method": method,
+                    "endpoint": endpoint,
+                    "attack_type": attack_type,
+                    "severity": severity,
+                    "confidence": attack_confidence,
+                    "anomaly_score": attack_anomaly_score,
+                }
+                for timestamp, ip, country, user_agent, method, endpoint, severity, attack_confidence, attack_anomaly_score in columns
+            ]
+        finally:
+            if gc_enabled:
+                gc.enable()
+    
+    async def generate_normal_traffic(self, count: int = 50) -> List[Dict[str, Any]]:
+        """Generate normal web traffic"""
+        return self._generate_batch(
+            count, "normal", USER_AGENTS["normal"], ("GET", "POST"),
+            ("/api/users", "/api/products", "/api/search", "/api/about", "/api/contact", "/api/help"),
+            ("low",), (0.1, 0.3), (0.1, 0.4)
+        )
     
     async def generate_sql_injection_attacks(self, count: int = 30) -> List[Dict[str, Any]]:
         """Generate SQL injection attacks"""
-        attacks = []
-        
-        for i in range(count):
-            country = random.choice(COUNTRIES)
-            ip = random.choice(country["ips"])
-            
-            attack = {
-                "timestamp": datetime.utcnow() - timedelta(minutes=random.randint(1, 1440)),
-                "source_ip": ip,
-                "country": country["name"],
-                "user_agent": random.choice(USER_AGENTS["sqlmap"] + USER_AGENTS["normal"]),
-                "method": "GET",
-                "endpoint": random.choice(ATTACK_PATTERNS["sql_injection"]),
-                "attack_type": "sql_injection",
-                "severity": random.choice(["high", "critical"]),
-                "confidence": random.uniform(0.7, 0.95),
-                "anomaly_score": random.uniform(0.6, 0.9),
-            }
-            attacks.append(attack)
-        
-        return attacks
+        return self._generate_batch(
+            count, "sql_injection", UA_SQL, ("GET",),
+            ATTACK_PATTERNS["sql_injection"], ("high", "critical"), (0.7, 0.95), (0.6, 0.9)
+        )
     
     async def generate_xss_attacks(self, count: int = 25) -> List[Dict[str, Any]]:
         """Generate XSS attacks"""
-        attacks = []
-        
-        for i in range(count):
-            country = random.choice(COUNTRIES)
-            ip = random.choice(country["ips"])
-            
-            attack = {
-                "timestamp": datetime.utcnow() - timedelta(minutes=random.randint(1, 1440)),
-                "source_ip": ip,
-                "country": country["name"],
-                "user_agent": random.choice(USER_AGENTS["normal"]),
-                "method": random.choice(["GET", "POST"]),
-                "endpoint": random.choice(ATTACK_PATTERNS["xss"]),
-                "attack_type": "xss",
-                "severity": random.choice(["medium", "high"]),
-                "confidence": random.uniform(0.6, 0.8),
-                "anomaly_score": random.uniform(0.5, 0.8),
-            }
-            attacks.append(attack)
-        
-        return attacks
+        return self._generate_batch(
+            count, "xss", USER_AGENTS["normal"], ("GET", "POST"),
+            ATTACK_PATTERNS["xss"], ("medium", "high"), (0.6, 0.8), (0.5, 0.8)
+        )
     
     async def generate_directory_traversal_attacks(self, count: int = 20) -> List[Dict[str, Any]]:
         """Generate directory traversal attacks"""
-        attacks = []
-        
-        for i in range(count):
-            country = random.choice(COUNTRIES)
-            ip = random.choice(country["ips"])
-            
-            attack = {
-                "timestamp": datetime.utcnow() - timedelta(minutes=random.randint(1, 1440)),
-                "source_ip": ip,
-                "country": country["name"],
-                "user_agent": random.choice(USER_AGENTS["nikto"] + USER_AGENTS["nmap"]),
-                "method": "GET",
-                "endpoint": random.choice(ATTACK_PATTERNS["directory_traversal"]),
-                "attack_type": "directory_traversal",
-                "severity": random.choice(["high", "critical"]),
-                "confidence": random.uniform(0.8, 0.95),
-                "anomaly_score": random.uniform(0.7, 0.9),
-            }
-            attacks.append(attack)
-        
-        return attacks
+        return self._generate_batch(
+            count, "directory_traversal", UA_TRAVERSAL, ("GET",),
+            ATTACK_PATTERNS["directory_traversal"], ("high", "critical"), (0.8, 0.95), (0.7, 0.9)
+        )
     
     async def generate_brute_force_attacks(self, count: int = 40) -> List[Dict[str, Any]]:
         """Generate brute force attacks"""
-        attacks = []
-        
-        for i in range(count):
-            country = random.choice(COUNTRIES)
-            ip = random.choice(country["ips"])
-            
-            attack = {
-                "timestamp": datetime.utcnow() - timedelta(minutes=random.randint(1, 1440)),
-                "source_ip": ip,
-                "country": country["name"],
-                "user_agent": random.choice(USER_AGENTS["normal"]),
-                "method": "POST",
-                "endpoint": random.choice(ATTACK_PATTERNS["brute_force"]),
-                "attack_type": "brute_force",
-                "severity": random.choice(["medium", "high"]),
-                "confidence": random.uniform(0.5, 0.8),
-                "anomaly_score": random.uniform(0.4, 0.7),
-            }
-            attacks.append(attack)
-        
-        return attacks
+        return self._generate_batch(
+            count, "brute_force", USER_AGENTS["normal"], ("POST",),
+            ATTACK_PATTERNS["brute_force"], ("medium", "high"), (0.5, 0.8), (0.4, 0.7)
+        )
     
     async def generate_automated_tool_attacks(self, count: int = 35) -> List[Dict[str, Any]]:
         """Generate automated tool attacks"""
-        attacks = []
-        
-        for i in range(count):
-            country = random.choice(COUNTRIES)
-            ip = random.choice(country["ips"])
-            
-            attack = {
-                "timestamp": datetime.utcnow() - timedelta(minutes=random.randint(1, 1440)),
-                "source_ip": ip,
-                "country": country["name"],
-                "user_agent": random.choice(USER_AGENTS["nikto"] + USER_AGENTS["nmap"] + USER_AGENTS["burp"]),
-                "method": "GET",
-                "endpoint": random.choice(ATTACK_PATTERNS["automated_tool"]),
-                "attack_type": "automated_tool",
-                "severity": random.choice(["medium", "high"]),
-                "confidence": random.uniform(0.6, 0.9),
-                "anomaly_score": random.uniform(0.5, 0.8),
-            }
-            attacks.append(attack)
-        
-        return attacks
+        return self._generate_batch(
+            count, "automated_tool", UA_AUTOMATED, ("GET",),
+            ATTACK_PATTERNS["automated_tool"], ("medium", "high"), (0.6, 0.9), (0.5, 0.8)
+        )
     
     async def generate_all_attacks(self, count: int = 100) -> List[Dict[str, Any]]:
         """Generate a mix of all attack types"""
@@ -297,9 +357,9 @@ class SyntheticAttackGenerator:
         all_attacks.extend(await self.generate_brute_force_attacks(brute_count))
         all_attacks.extend(await self.generate_automated_tool_attacks(automated_count))
         
-        # Shuffle and sort by timestamp
-        random.shuffle(all_attacks)
-        all_attacks.sort(key=lambda x: x["timestamp"])
+        # Sort by timestamp; records are already random, so no shuffle is needed
+        timestamps = np.array([attack["timestamp"] for attack in all_attacks], dtype="datetime64[us]")
+        all_attacks = [all_attacks[i] for i in np.argsort(timestamps, kind="stable").tolist()]
         
         logger.info(f"✅ Generated {len(all_attacks)} synthetic attacks")
         return all_attacks
@@ -308,35 +368,54 @@ class SyntheticAttackGenerator:
         """Simulate real-time attack generation"""
         logger.info(f"🚀 Starting real-time attack simulation for {duration_minutes} minutes...")
         
-        start_time = time.time()
-        end_time = start_time + (duration_minutes * 60)
+        # Monotonic deadlines keep the target rate regardless of send latency or clock jumps
+        deadline = time.monotonic()
+        end_time = deadline + (duration_minutes * 60)
         attack_count = 0
         
-        while time.time() < end_time:
-            # Generate a random attack
-            attack_types = [
-                self.generate_sql_injection_attacks(1),
-                self.generate_xss_attacks(1),
-                self.generate_directory_traversal_attacks(1),
-                self.generate_brute_force_attacks(1),
-                self.generate_automated_tool_attacks(1),
-            ]
-            
-            attacks = await random.choice(attack_types)
-            if attacks:
-                attack = attacks[0]
-                attack["timestamp"] = datetime.utcnow()
-                
+        # Sends run as bounded background tasks so pacing doesn't wait on them
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+        
+        async def send(attack: Dict[str, Any]):
+            nonlocal attack_count
+            async with semaphore:
                 # Simulate sending to honeypot
                 try:
                     await self._send_attack_to_honeypot(attack)
                     attack_count += 1
-                    logger.info(f"📡 Sent attack #{attack_count}: {attack['attack_type']} from {attack['source_ip']}")
+                    # Per-attack logs are built only when INFO is enabled
+                    if logger.isEnabledFor(logging.INFO):
+                        _, flag = IP_TO_COUNTRY[attack["source_ip"]]
+                        logger.info("📡 Sent attack #%d: %s from %s %s", attack_count, attack["attack_type"], attack["source_ip"], flag)
                 except Exception as e:
-                    logger.error(f"❌ Error sending attack: {e}")
+                    logger.error("❌ Error sending attack: %s", e)
+        
+        # Bound generator methods; only the one picked each tick is called
+        generators = (
+            self.generate_sql_injection_attacks,
+            self.generate_xss_attacks,
+            self.generate_directory_traversal_attacks,
+            self.generate_brute_force_attacks,
+            self.generate_automated_tool_attacks,
+        )
+        
+        while time.monotonic() < end_time:
+            # Generate a random attack
+            attacks = await generators[self.rng.integers(len(generators))](1)
+            if attacks:
+                attack = attacks[0]
+                attack["timestamp"] = datetime.utcnow()
+                
+                task = asyncio.create_task(send(attack))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
             
-            # Wait before next attack
-            await asyncio.sleep(interval_seconds)
+            # Wait until the next attack is due
+            deadline += interval_seconds
+            await asyncio.sleep(max(0, deadline - time.monotonic()))
+        
+        await asyncio.gather(*tasks, return_exceptions=True)
         
         logger.info(f"🏁 Simulation complete. Generated {attack_count} real-time attacks.")
     
@@ -347,33 +426,28 @@ class SyntheticAttackGenerator:
         
         try:
             # Choose appropriate endpoint based on attack type
-            if attack["attack_type"] == "brute_force":
-                endpoint = "/api/honeypots/login"
-                method = "POST"
-                data = {"username": "admin", "password": "password"}
-            elif attack["attack_type"] == "sql_injection":
-                endpoint = "/api/honeypots/sql"
-                method = "GET"
-                data = None
-                params = {"query": attack["endpoint"]}
-            elif attack["attack_type"] == "directory_traversal":
-                endpoint = "/api/honeypots/file"
-                method = "GET"
-                data = None
-                params = {"path": attack["endpoint"]}
+            handler = self._handlers.get(attack["attack_type"])
+            if handler:
+                url, method, data, param = handler
+                params = {param: attack["endpoint"]} if param else None
             else:
                 endpoint = attack["endpoint"]
+                url = self._urls.get(endpoint)
+                if url is None:
+                    url = self._urls[endpoint] = f"{self.base_url}{endpoint}"
                 method = attack["method"]
                 data = None
                 params = None
             
             # Send request
-            url = f"{self.base_url}{endpoint}"
             headers = {
                 "User-Agent": attack["user_agent"],
                 "X-Forwarded-For": attack["source_ip"],
             }
             
+            if data is not None:
+                headers["Content-Type"] = "application/x-www-form-urlencoded"
+            
             if method == "GET":
                 async with self.session.get(url, headers=headers, params=params) as response:
                     pass
@@ -382,7 +456,7 @@ class SyntheticAttackGenerator:
                     pass
             
         except Exception as e:
-            logger.error(f"Error sending attack to honeypot: {e}")
+            logger.error("Error sending attack to honeypot: %s", e)
 
 async def main():
     """Main function"""
@@ -395,43 +469,51 @@ async def main():
     parser.add_argument("--interval", type=int, default=30, help="Interval between attacks in seconds")
     parser.add_argument("--url", default="http://localhost:8000", help="Base URL of the honeypot")
     parser.add_argument("--output", help="Output file for generated attacks")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON written to --output")
+    parser.add_argument("--ndjson", action="store_true", help="Stream --output as newline-delimited JSON")
+    parser.add_argument("--seed", type=int, help="Random seed for reproducible attacks")
     
     args = parser.parse_args()
     
-    async with SyntheticAttackGenerator(args.url) as generator:
+    async with SyntheticAttackGenerator(args.url, seed=args.seed) as generator:
         if args.real_time:
             await generator.simulate_real_time_attacks(args.duration, args.interval)
         else:
-            if args.type == "all":
-                attacks = await generator.generate_all_attacks(args.count)
-            elif args.type == "normal":
-                attacks = await generator.generate_normal_traffic(args.count)
-            elif args.type == "sql":
-                attacks = await generator.generate_sql_injection_attacks(args.count)
-            elif args.type == "xss":
-                attacks = await generator.generate_xss_attacks(args.count)
-            elif args.type == "traversal":
-                attacks = await generator.generate_directory_traversal_attacks(args.count)
-            elif args.type == "brute":
-                attacks = await generator.generate_brute_force_attacks(args.count)
-            elif args.type == "automated":
-                attacks = await generator.generate_automated_tool_attacks(args.count)
+            generate = {
+                "all": generator.generate_all_attacks,
+                "normal": generator.generate_normal_traffic,
+                "sql": generator.generate_sql_injection_attacks,
+                "xss": generator.generate_xss_attacks,
+                "traversal": generator.generate_directory_traversal_attacks,
+                "brute": generator.generate_brute_force_attacks,
+                "automated": generator.generate_automated_tool_attacks,
+            }[args.type]
+            
+            if args.output and args.ndjson:
+                saved = await stream_attacks(args.output, generate, args.count)
+                logger.info(f"💾 Saved {saved} attacks to {args.output}")
+                return
+            
+            attacks = await generate(args.count)
             
             # Output results
             if args.output:
-                with open(args.output, 'w') as f:
-                    json.dump(attacks, f, indent=2, default=str)
+                write_attacks(args.output, attacks, pretty=args.pretty)
                 logger.info(f"💾 Saved {len(attacks)} attacks to {args.output}")
             else:
                 # Print summary
-                attack_types = {}
-                for attack in attacks:
-                    attack_type = attack["attack_type"]
-                    attack_types[attack_type] = attack_types.get(attack_type, 0) + 1
+                attack_types = Counter(attack["attack_type"] for attack in attacks)
                 
                 logger.info("📊 Attack Summary:")
-                for attack_type, count in attack_types.items():
+                for attack_type, count in attack_types.most_common():
                     logger.info(f"   {attack_type}: {count}")
 
 if __name__ == "__main__":
+    # Prefer the libuv event loop when available (not on Windows)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())